@@ -153,6 +153,69 @@ class AnalogCPU:
         # Vout = α*Vin + (1-α)*Vout_prev
         return alpha * vin + (1 - alpha) * vin_prev
     
+    # ---- 数组版本：整块采样进、整块采样出 ----
+    
+    def sum_amplifier_block(self, *signals):
+        """求和放大器（数组）：Vout = clip(-(V1 + V2 + ...))"""
+        total = np.add.reduce(np.broadcast_arrays(*signals))
+        return np.clip(-total, -self.vdd, self.vdd)
+    
+    def gain_block(self, vin, gain):
+        """反相放大器（数组）：Vout = clip(-G·Vin)"""
+        return np.clip(-gain * np.asarray(vin), -self.vdd, self.vdd)
+    
+    def multiply_block(self, v1, v2):
+        """模拟乘法器（数组）：Vout = clip(V1·V2/10)"""
+        return np.clip(np.multiply(v1, v2) / 10.0, -self.vdd, self.vdd)
+    
+    def rectify_block(self, vin):
+        """全波整流（数组）"""
+        return np.abs(vin)
+    
+    def saturate_block(self, vin):
+        """tanh 饱和（数组）"""
+        return self.vdd * np.tanh(np.asarray(vin) / self.vdd)
+    
+    def iir_block(self, vin, b, a, state=None):
+        """
+        通用 IIR 滤波（数组）：差分方程 Σ a_k y[n-k] = Σ b_k x[n-k]
+
+        用 scipy.signal.lfilter 的直接II型转置递推（C实现），
+        state 为上一块结束时的滤波器状态，返回 (输出, 新状态)，
+        分块连续调用与一次处理整段信号结果相同。
+        """
+        from scipy.signal import lfilter
+        
+        vin = np.asarray(vin)
+        b = np.asarray(b, dtype=vin.dtype if vin.dtype.kind == 'f' else float)
+        a = np.asarray(a, dtype=b.dtype)
+        if state is None:
+            state = np.zeros(max(len(a), len(b)) - 1, dtype=b.dtype)
+        return lfilter(b, a, vin, zi=state)
+    
+    def lowpass_block(self, vin, alpha=0.1, state=None):
+        """
+        一阶低通（数组）：y[n] = α·x[n] + (1-α)·y[n-1]
+
+        与 lowpass_filter 逐点调用的结果一致；state 为 (1-α)·y[-1]，
+        初次调用可用 lowpass_state(alpha, y_prev) 由上一输出值构造。
+        """
+        return self.iir_block(vin, [alpha], [1.0, -(1 - alpha)], state)
+    
+    @staticmethod
+    def lowpass_state(alpha, y_prev):
+        """由上一输出值构造一阶低通的滤波器状态"""
+        return np.array([(1 - alpha) * y_prev])
+    
+    def netlist(self):
+        """新建网表（电源轨与本CPU一致）"""
+        return AnalogNetlist(self.vdd)
+    
+    def monte_carlo(self, net, tolerance=0.01, noise=0.0, distribution='normal', probes=None,
+                    spec=None):
+        """创建网表的蒙特卡洛容差/噪声分析器"""
+        return AnalogMonteCarlo(net, tolerance, noise, distribution, probes, spec)
+    
     def _clip(self, voltage):
         """限幅到电源范围"""
         return max(-self.vdd, min(self.vdd, voltage))
@@ -190,6 +253,431 @@ class AnalogCPU:
                     print(f"  {instr:<15} - {info['desc']:<15} [{info['circuit']}]")
                     print(f"                  公式: {info['formula']}")
 
+class AnalogNetlist:
+    """
+    模拟电路网表 - 把 SUM / GAIN / INTEGRATE / MULTIPLY / COMPARE 块连成图
+
+    块的语义与 AnalogCPU 的单步函数一致：
+      SUM       Vout = -(Σ wᵢ·Vᵢ)            （反相加法器，限幅）
+      GAIN      Vout = -G·Vin                （反相放大器，限幅）
+      MULTIPLY  Vout = V1·V2/10              （限幅）
+      COMPARE   Vout = (V1 > V2) ? Vdd : 0
+      INTEGRATE dVout/dt = Σ wᵢ·Vᵢ           （状态量；到达 ±Vdd 后饱和不再外冲）
+      SOURCE    常数或 f(t)
+    compile() 把代数块按拓扑层分组，每层同类块一次向量化求值
+    （线性块：gather + reduceat；乘法/比较：成对下标），得到 rhs(t, x)，
+    交给 scipy 的 RK45（非刚性）或 BDF（刚性，带稀疏雅可比结构）积分。
+    代数环（不经过积分器的回路）在编译时报错。
+    """
+
+    LINEAR = ('SUM', 'GAIN')
+
+    def __init__(self, vdd=10.0):
+        self.vdd = vdd
+        self.kind = []        # 每块的类型
+        self.inputs = []      # 每块的 [(源块, 权重), ...]
+        self.value = []       # SOURCE 的常数或函数；INTEGRATE 的初值
+        self.names = {}
+        self._compiled = None
+
+    def _add(self, kind, inputs=(), value=0.0, name=None):
+        block = len(self.kind)
+        self.kind.append(kind)
+        self.inputs.append([])
+        self.value.append(value)
+        if name is not None:
+            self.names[name] = block
+        for src in inputs:
+            src, weight = src if isinstance(src, tuple) else (src, 1.0)
+            self.connect(block, src, weight)
+        return block
+
+    def connect(self, dst, src, weight=1.0):
+        """把 src 接到 dst 的一个输入（允许先建块、后接线，用于反馈回路）"""
+        self.inputs[dst].append((src, float(weight)))
+        self._compiled = None
+        return self
+
+    def source(self, value=0.0, name=None):
+        """信号源：常数，或 t → 电压 的函数"""
+        return self._add('SOURCE', value=value, name=name)
+
+    def sum(self, inputs=(), weights=None, name=None):
+        weights = weights if weights is not None else [1.0] * len(inputs)
+        return self._add('SUM', list(zip(inputs, weights)), name=name)
+
+    def gain(self, vin=None, gain=1.0, name=None):
+        return self._add('GAIN', [(vin, gain)] if vin is not None else [], name=name)
+
+    def multiply(self, v1, v2, name=None):
+        return self._add('MULTIPLY', [v1, v2], name=name)
+
+    def compare(self, v1, v2, name=None):
+        return self._add('COMPARE', [v1, v2], name=name)
+
+    def integrator(self, inputs=(), weights=None, initial=0.0, name=None):
+        weights = weights if weights is not None else [1.0] * len(inputs)
+        return self._add('INTEGRATE', list(zip(inputs, weights)), value=initial, name=name)
+
+    def __len__(self):
+        return len(self.kind)
+
+    @staticmethod
+    def _edges(blocks, inputs):
+        """一组块的输入边：(源下标, 权重, 每块起点)，供 gather + reduceat 求和"""
+        cols, weights, starts = [], [], []
+        for b in blocks:
+            starts.append(len(cols))
+            for src, w in inputs[b]:
+                cols.append(src)
+                weights.append(w)
+        return (np.array(cols, dtype=np.intp), np.array(weights), np.array(starts, dtype=np.intp))
+
+    def compile(self):
+        """拓扑分层并预先构造各层的下标/权重数组"""
+        if self._compiled is not None:
+            return self._compiled
+        kind, inputs = self.kind, self.inputs
+        n = len(kind)
+        roots = {'SOURCE', 'INTEGRATE'}
+        # Kahn 拓扑排序：只统计代数块之间的依赖，入度归零即可求值
+        level = [0 if kind[b] in roots else None for b in range(n)]
+        indegree = [0] * n
+        consumers = [[] for _ in range(n)]
+        for b in range(n):
+            if level[b] is None:
+                for src, _ in inputs[b]:
+                    if level[src] is None:
+                        indegree[b] += 1
+                        consumers[src].append(b)
+        order = [b for b in range(n) if level[b] is None and indegree[b] == 0]
+        buckets = []
+        i = 0
+        while i < len(order):
+            b = order[i]
+            i += 1
+            level[b] = 1 + max((level[src] for src, _ in inputs[b]), default=0)
+            if level[b] > len(buckets):
+                buckets.append([])
+            buckets[level[b] - 1].append(b)
+            for dst in consumers[b]:
+                indegree[dst] -= 1
+                if indegree[dst] == 0:
+                    order.append(dst)
+        if None in level:
+            pending = [b for b in range(n) if level[b] is None]
+            raise ValueError(f"代数环：块 {pending[:10]} 的回路未经过积分器")
+        
+        levels = []
+        for members in buckets:
+            members.sort()
+            linear = [b for b in members if kind[b] in self.LINEAR and inputs[b]]
+            zeros = [b for b in members if kind[b] in self.LINEAR and not inputs[b]]
+            mul = [b for b in members if kind[b] == 'MULTIPLY']
+            cmp = [b for b in members if kind[b] == 'COMPARE']
+            levels.append({
+                'linear': (np.array(linear, dtype=np.intp), self._edges(linear, inputs)),
+                'zero': np.array(zeros, dtype=np.intp),
+                'mul': tuple(np.array(x, dtype=np.intp) for x in
+                             ([b for b in mul], [inputs[b][0][0] for b in mul], [inputs[b][1][0] for b in mul])),
+                'cmp': tuple(np.array(x, dtype=np.intp) for x in
+                             ([b for b in cmp], [inputs[b][0][0] for b in cmp], [inputs[b][1][0] for b in cmp])),
+            })
+        states = np.array([b for b in range(n) if kind[b] == 'INTEGRATE'], dtype=np.intp)
+        sources = [b for b in range(n) if kind[b] == 'SOURCE']
+        const = [b for b in sources if not callable(self.value[b])]
+        self._compiled = {
+            'levels': levels,
+            'order': np.array(order, dtype=np.intp),
+            'states': states,
+            'state_edges': self._edges(states, inputs),
+            'state_has_input': np.array([bool(inputs[b]) for b in states]),
+            'const': (np.array(const, dtype=np.intp), np.array([self.value[b] for b in const], dtype=float)),
+            'funcs': [(b, self.value[b]) for b in sources if callable(self.value[b])],
+            'initial': np.array([self.value[b] for b in states], dtype=float),
+        }
+        return self._compiled
+
+    @staticmethod
+    def _weighted_sum(v, edges, weights=None):
+        """Σ w·v[src]，按块分段求和；v 可带尾部的试验维 (N, T)"""
+        cols, w, starts = edges
+        if weights is None:
+            weights = w
+        terms = v[cols] * (weights.reshape(weights.shape + (1,) * (v.ndim - weights.ndim)))
+        return np.add.reduceat(terms, starts, axis=0)
+
+    def signals(self, t, x, weights=None):
+        """
+        由积分器状态 x（形状 (状态数,) 或 (状态数, T)）求出全部块的输出
+
+        weights 可覆盖各层的边权重（用于容差扫描，形状 (边数,) 或 (边数, T)）。
+        """
+        c = self.compile()
+        vdd = self.vdd
+        v = np.zeros((len(self.kind),) + x.shape[1:])
+        v[c['states']] = np.clip(x, -vdd, vdd)
+        idx, vals = c['const']
+        v[idx] = vals.reshape(vals.shape + (1,) * (x.ndim - 1))
+        for b, func in c['funcs']:
+            v[b] = func(t)
+        for i, lv in enumerate(c['levels']):
+            blocks, edges = lv['linear']
+            if len(blocks):
+                w = weights['levels'][i] if weights is not None else None
+                v[blocks] = np.clip(-self._weighted_sum(v, edges, w), -vdd, vdd)
+            out, a, b = lv['mul']
+            if len(out):
+                v[out] = np.clip(v[a] * v[b] / 10.0, -vdd, vdd)
+            out, a, b = lv['cmp']
+            if len(out):
+                v[out] = np.where(v[a] > v[b], vdd, 0.0)
+        return v
+
+    def derivative(self, t, x, weights=None, v=None):
+        """积分器的 dx/dt（含饱和：到达电源轨后不再向外积分）"""
+        c = self.compile()
+        v = self.signals(t, x, weights) if v is None else v
+        dx = np.zeros_like(x, dtype=float)
+        has = c['state_has_input']
+        if has.any():
+            edges = c['state_edges']
+            cols, w, starts = edges
+            w = weights['states'] if weights is not None else w
+            dx[has] = self._weighted_sum(v, (cols, w, starts[has]), w)
+        dx[((x >= self.vdd) & (dx > 0)) | ((x <= -self.vdd) & (dx < 0))] = 0.0
+        return dx
+
+    def jacobian_sparsity(self):
+        """
+        d(dx)/dx 的稀疏结构
+
+        按拓扑序一遍传播“哪些状态影响该块”（单输入块直接共享上游集合），
+        再对每个积分器的输入取并集。
+        """
+        from scipy import sparse
+        
+        c = self.compile()
+        inputs = self.inputs
+        m = len(c['states'])
+        empty = frozenset()
+        deps = [empty] * len(self.kind)
+        for k, b in enumerate(c['states']):
+            deps[b] = frozenset((k,))
+        for b in c['order']:
+            srcs = inputs[b]
+            deps[b] = deps[srcs[0][0]] if len(srcs) == 1 else empty.union(*(deps[src] for src, _ in srcs))
+        rows, cols = [], []
+        for k, b in enumerate(c['states']):
+            reached = empty.union(*(deps[src] for src, _ in inputs[b]))
+            rows.extend([k] * len(reached))
+            cols.extend(reached)
+        return sparse.csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=(m, m))
+    
+    def simulate(self, t_span, t_eval=None, method='RK45', rtol=1e-6, atol=1e-9, probes=None,
+                 initial=None):
+        """
+        积分整个网表
+
+        method: 'RK45'（自适应显式）或 'BDF' / 'Radau'（隐式，刚性电路，自动给出稀疏雅可比结构）
+        probes: 需要记录输出的块列表（默认只记录积分器）
+        返回 {'t', 'states', 'probes', 'nfev', 'method', 'success', 'message'}
+        """
+        from scipy.integrate import solve_ivp
+        
+        c = self.compile()
+        x0 = c['initial'] if initial is None else np.asarray(initial, dtype=float)
+        options = {}
+        if method in ('BDF', 'Radau'):
+            options['jac_sparsity'] = self.jacobian_sparsity()
+        sol = solve_ivp(lambda t, x: self.derivative(t, x), t_span, x0, method=method,
+                        t_eval=t_eval, rtol=rtol, atol=atol, **options)
+        result = {'t': sol.t, 'states': np.clip(sol.y, -self.vdd, self.vdd), 'nfev': sol.nfev,
+                  'method': method, 'success': sol.success, 'message': sol.message, 'probes': None}
+        if probes is not None:
+            probes = np.asarray(probes, dtype=np.intp)
+            result['probes'] = np.stack([self.signals(t, sol.y[:, i])[probes]
+                                         for i, t in enumerate(sol.t)], axis=1)
+        return result
+
+def _perturbed_weights(compiled, trials, tolerance, distribution, rng):
+    """给每条边、每次试验抽一个 (1 + 误差) 因子，构造 signals/derivative 的权重覆盖"""
+    def draw(w):
+        if distribution == 'normal':
+            eps = rng.standard_normal((len(w), trials))
+        elif distribution == 'uniform':
+            eps = rng.uniform(-1.0, 1.0, (len(w), trials))
+        else:
+            raise ValueError(f"未知分布: {distribution}")
+        return w[:, None] * (1.0 + tolerance * eps)
+    return {'levels': [draw(lv['linear'][1][1]) for lv in compiled['levels']],
+            'states': draw(compiled['state_edges'][1])}
+
+def _run_trials(net, trials, t_end, dt, probes, tolerance=0.0, distribution='normal', noise=0.0,
+                rng=None):
+    """
+    固定步长 RK4 + 加性热噪声（Euler–Maruyama）同时积分 trials 次试验
+
+    状态形状 (状态数, trials)，每步一次向量化求值覆盖全部试验；返回探针终值 (探针数, trials)。
+    """
+    c = net.compile()
+    weights = _perturbed_weights(c, trials, tolerance, distribution, rng) if tolerance else None
+    x = np.repeat(c['initial'][:, None], trials, axis=1)
+    steps = max(int(math.ceil(t_end / dt)), 1)
+    h = t_end / steps
+    f = lambda t, x: net.derivative(t, x, weights)
+    vdd = net.vdd
+    for i in range(steps):
+        t = i * h
+        k1 = f(t, x)
+        k2 = f(t + h / 2, x + h / 2 * k1)
+        k3 = f(t + h / 2, x + h / 2 * k2)
+        k4 = f(t + h, x + h * k3)
+        x = x + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        if noise:
+            x += noise * math.sqrt(h) * rng.standard_normal(x.shape)
+        np.clip(x, -vdd, vdd, out=x)
+    return net.signals(t_end, x, weights)[probes]
+
+def _monte_carlo_worker(task):
+    """工作进程：一块试验（种子来自 RNGService，结果与调度无关）"""
+    seed_seq, net, size, t_end, dt, probes, tolerance, distribution, noise = task
+    rng = np.random.default_rng(seed_seq)
+    return _run_trials(net, size, t_end, dt, probes, tolerance, distribution, noise, rng)
+
+class AnalogMonteCarlo:
+    """
+    蒙特卡洛容差 / 噪声分析
+
+    对同一网表抽样数千次：
+      - 元件容差：每条连线权重（电阻比、增益、积分器 1/RC）乘以 (1 + tolerance·ε)，
+        ε ~ N(0,1)（'normal'）或 U(-1,1)（'uniform'，如 ±1% 电阻）
+      - 热噪声：积分器状态上叠加 noise·√dt·N(0,1)（noise 单位 V/√s）
+    试验作为状态的额外一维 (状态数, T) 一次向量化积分；
+    大规模扫描按块分给多个进程（需网表可 pickle，函数信号源请用模块级函数）。
+
+    probes: 记录终值的块（默认全部积分器）
+    spec:   {探针块: (下限, 上限)}，全部探针都在范围内算一次合格；
+            spec 中的块必须出现在 probes 里，构造时检查。
+    """
+
+    PERCENTILES = (1, 5, 50, 95, 99)
+
+    def __init__(self, net: AnalogNetlist, tolerance=0.01, noise=0.0, distribution='normal',
+                 probes=None, spec=None):
+        if distribution not in ('normal', 'uniform'):
+            raise ValueError(f"未知分布: {distribution}")
+        self.net = net
+        self.tolerance = tolerance
+        self.noise = noise
+        self.distribution = distribution
+        c = net.compile()
+        self.probes = np.asarray(c['states'] if probes is None else probes, dtype=np.intp)
+        self.spec = dict(spec or {})
+        missing = [probe for probe in self.spec if probe not in self.probes]
+        if missing:
+            raise ValueError(f"spec 中的块 {missing} 不在 probes {self.probes.tolist()} 里")
+
+    def nominal(self, t_end, dt, probes):
+        """无容差、无噪声的标称输出"""
+        probes = np.asarray(probes, dtype=np.intp)
+        return _run_trials(self.net, 1, t_end, dt, probes)[:, 0]
+
+    def run(self, trials, t_end, dt=1e-3, workers=1, seed=None, chunk=1024):
+        """
+        运行扫描
+
+        返回 {'values', 'nominal', 'mean', 'std', 'percentiles', 'yield', 'yield_stderr',
+              'passed', 'trials'}，values 形状 (探针数, trials)
+        """
+        from rng_service import RNGService
+        
+        probes = self.probes
+        chunks = -(-trials // chunk)
+        sizes = [min(chunk, trials - i * chunk) for i in range(chunks)]
+        tasks = [(seed_seq, self.net, size, t_end, dt, probes, self.tolerance, self.distribution,
+                  self.noise) for seed_seq, size in zip(RNGService(seed).worker_seeds(chunks), sizes)]
+        if workers > 1:
+            from multiprocessing import Pool
+            with Pool(workers) as pool:
+                results = pool.map(_monte_carlo_worker, tasks)
+        else:
+            results = [_monte_carlo_worker(task) for task in tasks]
+        values = np.concatenate(results, axis=1)
+        
+        passed = np.ones(trials, dtype=bool)
+        for probe, (lo, hi) in self.spec.items():
+            row = values[int(np.flatnonzero(probes == probe)[0])]
+            passed &= (row >= lo) & (row <= hi)
+        good = passed.mean()
+        return {
+            'trials': trials,
+            'probes': probes,
+            'values': values,
+            'nominal': self.nominal(t_end, dt, probes),
+            'mean': values.mean(axis=1),
+            'std': values.std(axis=1, ddof=1) if trials > 1 else np.zeros(len(probes)),
+            'percentiles': dict(zip(self.PERCENTILES, np.percentile(values, self.PERCENTILES, axis=1))),
+            'passed': passed,
+            'yield': good,
+            'yield_stderr': math.sqrt(good * (1 - good) / trials),
+        }
+
+class AnalogSignalChain:
+    """
+    流式信号链：一串数组版原语，按块处理并在块间携带滤波器状态
+
+        chain = AnalogSignalChain(cpu).gain(2.0).lowpass(0.05).rectify().saturate()
+        for chunk in chunks:
+            out = chain.process(chunk)
+    """
+
+    def __init__(self, cpu: 'AnalogCPU' = None):
+        self.cpu = cpu if cpu is not None else AnalogCPU()
+        self.stages = []   # (名称, 参数)
+        self.states = []   # 每级的滤波器状态（无状态的级为 None）
+
+    def _stage(self, name, **params):
+        self.stages.append((name, params))
+        self.states.append(None)
+        return self
+
+    def gain(self, gain):
+        """反相放大 Vout = clip(-G·Vin)"""
+        return self._stage('gain', gain=gain)
+
+    def lowpass(self, alpha):
+        return self._stage('lowpass', alpha=alpha)
+
+    def iir(self, b, a):
+        return self._stage('iir', b=b, a=a)
+
+    def rectify(self):
+        return self._stage('rectify')
+
+    def saturate(self):
+        return self._stage('saturate')
+
+    def reset(self):
+        self.states = [None] * len(self.stages)
+
+    def process(self, chunk):
+        """处理一块采样，更新并保留各级状态"""
+        cpu = self.cpu
+        x = chunk
+        for i, (name, params) in enumerate(self.stages):
+            if name == 'gain':
+                x = cpu.gain_block(x, params['gain'])
+            elif name == 'lowpass':
+                x, self.states[i] = cpu.lowpass_block(x, params['alpha'], self.states[i])
+            elif name == 'iir':
+                x, self.states[i] = cpu.iir_block(x, params['b'], params['a'], self.states[i])
+            elif name == 'rectify':
+                x = cpu.rectify_block(x)
+            elif name == 'saturate':
+                x = cpu.saturate_block(x)
+        return x
+
 def demonstrate_analog_computing():
     """演示模拟计算"""
     cpu = AnalogCPU()
@@ -267,6 +755,79 @@ def demonstrate_analog_computing():
         filtered = cpu.lowpass_filter(v, filtered, alpha=0.3)
         filtered_signal.append(filtered)
     print(f"  滤波后:   {[f'{v:.2f}' for v in filtered_signal]}")
+    
+    # 9. 数组版原语：整块处理音频
+    import time
+    print("\n9. 数组版原语 + 流式处理 (48kHz 音频):")
+    y, _ = cpu.lowpass_block(np.array(noisy_signal), 0.3, cpu.lowpass_state(0.3, noisy_signal[0]))
+    print(f"  lowpass_block 与逐点结果一致: {np.allclose(y, filtered_signal)}")
+    rate, minutes, chunk = 48_000, 10, 1 << 20
+    total = rate * 60 * minutes
+    chain = AnalogSignalChain(cpu).gain(2.0).lowpass(0.05).rectify().lowpass(0.001).saturate()
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    done = 0
+    while done < total:
+        n = min(chunk, total - done)
+        t = (done + np.arange(n, dtype=np.float64)) / rate  # float32 超过 2^24 个采样就数不准
+        x = np.sin(2 * np.pi * 440 * t).astype(np.float32) + 0.1 * rng.standard_normal(n, dtype=np.float32)
+        out = chain.process(x)
+        done += n
+    elapsed = time.perf_counter() - start
+    print(f"  {minutes}分钟 ({total / 1e6:.1f}M采样, 块大小 {chunk:,}): {elapsed:.2f}s, "
+          f"{total / rate / elapsed:.0f}×实时, 包络输出 {out[-1]:.3f}V")
+    
+    # 10. 网表：模拟计算机解微分方程
+    print("\n10. 网表求解 x'' = -ω²x (两个积分器 + 反相放大器):")
+    net = cpu.netlist()
+    omega = 2 * math.pi
+    x = net.integrator(initial=1.0, name='x')
+    v = net.integrator(name='v')              # v = x'/ω，幅度与 x 相同，不会顶到电源轨
+    neg_x = net.gain(x, 1.0)                  # -x
+    net.connect(v, neg_x, omega)              # v' = -ω·x
+    net.connect(x, v, omega)                  # x' = ω·v
+    result = net.simulate((0, 1), t_eval=np.linspace(0, 1, 5))
+    for t, xv in zip(result['t'], result['states'][0]):
+        print(f"  t={t:.2f}s: x={xv:+.4f} (理论 {math.cos(omega * t):+.4f})")
+    
+    print("\n  RC梯形网络 (刚性, 5000节 = 10000块):")
+    sections = 5000
+    net = cpu.netlist()
+    vin = net.source(5.0)
+    nodes = [net.integrator() for _ in range(sections)]
+    k = 1e4  # 1/RC
+    for i, node in enumerate(nodes):
+        left = vin if i == 0 else nodes[i - 1]
+        if i + 1 < sections:
+            diff = net.sum([left, nodes[i + 1], node], [1.0, 1.0, -2.0])  # -(左+右-2·自己)
+        else:
+            diff = net.sum([left, node], [1.0, -1.0])
+        net.connect(node, diff, -k)
+    for method in ('RK45', 'BDF'):
+        start = time.perf_counter()
+        result = net.simulate((0, 0.02), method=method, rtol=1e-4, atol=1e-6)
+        elapsed = time.perf_counter() - start
+        print(f"  {method}: {len(net):,}块, {len(result['t'])}步, {result['nfev']}次RHS求值, "
+              f"{elapsed:.2f}s, 第1/10/100节电压: "
+              f"{result['states'][0, -1]:.3f}V / {result['states'][9, -1]:.3f}V / {result['states'][99, -1]:.3f}V")
+    
+    # 11. 蒙特卡洛：容差与热噪声下的精度
+    print("\n11. 蒙特卡洛容差/噪声扫描 (振荡器 x(1s)，规格 x ∈ [0.995, 1.0]):")
+    net = cpu.netlist()
+    x = net.integrator(initial=1.0)
+    v = net.integrator()
+    net.connect(v, net.gain(x, 1.0), omega)
+    net.connect(x, v, omega)
+    for tolerance, noise in [(0.001, 0.0), (0.01, 0.0), (0.01, 0.01)]:
+        start = time.perf_counter()
+        mc = cpu.monte_carlo(net, tolerance=tolerance, noise=noise, probes=[x], spec={x: (0.995, 1.0)})
+        report = mc.run(4000, 1.0, dt=1e-3, seed=2025)
+        elapsed = time.perf_counter() - start
+        p1, p50, p99 = (report['percentiles'][q][0] for q in (1, 50, 99))
+        print(f"  容差{tolerance:.1%} 噪声{noise}V/√s: 均值 {report['mean'][0]:.4f} "
+              f"σ {report['std'][0]:.4f} [1%/50%/99%: {p1:.4f}/{p50:.4f}/{p99:.4f}] "
+              f"良率 {report['yield']:.1%}±{report['yield_stderr']:.1%} "
+              f"({report['trials']}次, {elapsed:.2f}s)")
 
 def analyze_analog_cpu():
     """分析模拟CPU特性"""
@@ -10,11 +10,16 @@
 - 异步并行（无全局时钟）
 """
 
+import math
 import random
+import struct
+import zlib
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from enum import IntEnum
 
+import numpy as np
+
 class NeuronInstruction(IntEnum):
     """神经元指令集 - 极简12条"""
     # 输入处理
@@ -90,7 +95,7 @@ class Neuron:
         if instruction == NeuronInstruction.RECEIVE:
             return self._receive()
         elif instruction == NeuronInstruction.INTEGRATE:
-            return self._integrate()
+            return self._integrate(kwargs.get('input_current'))
         elif instruction == NeuronInstruction.FIRE:
             return self._fire()
         elif instruction == NeuronInstruction.INHIBIT:
@@ -116,13 +121,14 @@ class Neuron:
             total_input += synapse.weight if synapse.type == 'excitatory' else -synapse.weight
         return total_input
     
-    def _integrate(self):
-        """积分输入（Leaky Integrate-and-Fire模型）"""
+    def _integrate(self, input_current: Optional[float] = None):
+        """积分输入（Leaky Integrate-and-Fire模型）；input_current 为 None 时逐突触接收"""
         if self.refractory_period > 0:
             return
         
         # 接收输入
-        input_current = self._receive()
+        if input_current is None:
+            input_current = self._receive()
         
         # 更新膜电位：dV/dt = -(V - V_rest)/τ + I
         self.membrane_potential += input_current
@@ -187,12 +193,19 @@ class Neuron:
             self.threshold -= 0.05  # 提高敏感度
 
 class BiologicalNeuronCPU:
-    """生物神经元CPU - 完整系统"""
+    """
+    生物神经元CPU - 完整系统
+
+    神经元状态仍是 Neuron 对象，突触存成 CSR SynapseMatrix（self.synapses）。
+    Neuron.input_synapses / output_synapses 是 SynapseSlice 视图，
+    逐条访问时才生成 SynapseView，不常驻 Synapse 对象。
+    """
     
-    def __init__(self, num_neurons=1000):
+    def __init__(self, num_neurons=1000, stdp: Optional['STDPRule'] = None,
+                 seed: Optional[int] = None):
         self.neurons: List[Neuron] = []
-        self.synapses: List[Synapse] = []
         self.time_step = 0  # 时间步（ms）
+        self.stdp = stdp    # 为None时使用随机Hebbian学习
         
         # 创建神经元
         for i in range(num_neurons):
@@ -200,48 +213,49 @@ class BiologicalNeuronCPU:
             self.neurons.append(neuron)
         
         # 随机连接（模拟大脑连接）
-        self._create_random_connections()
+        self._create_random_connections(np.random.default_rng(seed))
     
-    def _create_random_connections(self):
-        """创建随机突触连接"""
+    def _create_random_connections(self, rng: np.random.Generator):
+        """创建随机突触连接：每个神经元连接到10-100个其他神经元"""
+        self.synapses = ConnectomeGenerator(rng).random(len(self.neurons), (10, 100))
         for neuron in self.neurons:
-            # 每个神经元连接到10-100个其他神经元
-            num_connections = random.randint(10, 100)
-            targets = random.sample(self.neurons, num_connections)
-            
-            for target in targets:
-                synapse_type = 'excitatory' if random.random() > 0.2 else 'inhibitory'
-                synapse = Synapse(
-                    source_id=neuron.id,
-                    target_id=target.id,
-                    weight=random.uniform(0.1, 0.9),
-                    type=synapse_type
-                )
-                neuron.output_synapses.append(synapse)
-                target.input_synapses.append(synapse)
-                self.synapses.append(synapse)
+            neuron.input_synapses = SynapseSlice(self.synapses, neuron.id, incoming=True)
+            neuron.output_synapses = SynapseSlice(self.synapses, neuron.id, incoming=False)
     
     def step(self):
         """执行一个时间步（1ms）"""
         spike_count = 0
+        fired: List[int] = []
+        
+        # 0. 每个神经元接收全部输入突触（同 Neuron._receive），一次稀疏求和
+        synapses = self.synapses
+        currents = np.bincount(synapses.indices, weights=synapses.signed_weight(np.arange(len(synapses))),
+                               minlength=len(self.neurons))
         
         # 所有神经元并行执行
-        for neuron in self.neurons:
+        for neuron, current in zip(self.neurons, currents.tolist()):
             # 1. 积分输入
-            neuron.execute(NeuronInstruction.INTEGRATE)
+            neuron.execute(NeuronInstruction.INTEGRATE, input_current=current)
             
             # 2. 检查是否发射
             if neuron.execute(NeuronInstruction.FIRE):
                 spike_count += 1
+                fired.append(neuron.id)
                 
-                # 3. Hebbian学习：同时激活的神经元连接增强
-                if random.random() < 0.1:  # 10%概率学习
-                    neuron.execute(NeuronInstruction.STRENGTHEN)
+                # 3. Hebbian学习：同时激活的神经元连接增强（CSR切片上的向量化 STRENGTHEN）
+                if self.stdp is None and random.random() < 0.1:  # 10%概率学习
+                    synapses.strengthen(np.array([neuron.id]), neuron.dopamine)
             
             # 4. 自适应
             if self.time_step % 100 == 0:  # 每100ms调整
                 neuron.execute(NeuronInstruction.ADAPT)
         
+        # 3'. STDP：只更新发射神经元的突触
+        if self.stdp is not None:
+            dopamine = np.fromiter((n.dopamine for n in self.neurons), dtype=np.float32,
+                                   count=len(self.neurons))
+            self.stdp.apply(self.time_step, np.array(fired, dtype=np.int64), synapses, dopamine)
+        
         self.time_step += 1
         return spike_count
     
@@ -268,6 +282,1220 @@ class BiologicalNeuronCPU:
             'total_synapses': len(self.synapses)
         }
 
+def _csr_gather(indptr: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """取出若干行在CSR数组中的全部下标（向量化，无Python循环）"""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(total, dtype=np.int64)
+
+class SynapseMatrix:
+    """
+    CSR稀疏突触矩阵 - 替代逐个 Synapse 对象
+
+    行 = 源神经元，列 = 目标神经元：
+    - indptr:  int64[n+1]   每个源神经元的突触区间
+    - indices: int32[nnz]   目标神经元
+    - weight:  float32[nnz] 权重幅度 (0-1)
+    - sign:    uint8[nnz/8] 符号位，1 = 抑制性（按位打包）
+    - delay:   uint8[nnz]   传导延迟（ms），可选；超过255ms时用 uint16
+    每条突触约 8-9 字节，而一个 Synapse 对象需要 100+ 字节。
+    """
+
+    def __init__(self, num_neurons: int, indptr: np.ndarray, indices: np.ndarray,
+                 weight: np.ndarray, inhibitory: np.ndarray,
+                 delay: Optional[np.ndarray] = None, plasticity: float = 0.01,
+                 num_targets: Optional[int] = None):
+        self.num_neurons = num_neurons
+        self.num_targets = num_neurons if num_targets is None else num_targets  # 列数
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weight = np.asarray(weight, dtype=np.float32)
+        self.sign = np.packbits(np.asarray(inhibitory, dtype=bool), bitorder='little')
+        self.delay = None if delay is None else self._delay_array(delay)
+        self.plasticity = plasticity
+        self._in_ptr: Optional[np.ndarray] = None    # 按目标神经元分组的转置索引（惰性）
+        self._in_order: Optional[np.ndarray] = None
+        self._in_source: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _delay_array(delay) -> np.ndarray:
+        """按最大延迟选 uint8 / uint16，超出范围报错而不是静默回绕"""
+        delay = np.asarray(delay)
+        if delay.dtype in (np.uint8, np.uint16):
+            return delay  # 已是紧凑类型（如内存映射加载），不必扫描
+        hi = int(delay.max()) if len(delay) else 0
+        if len(delay) and (int(delay.min()) < 1 or hi > np.iinfo(np.uint16).max):
+            raise ValueError(f"突触延迟须在 1~65535ms 之间，得到 {int(delay.min())}~{hi}")
+        return delay.astype(np.uint8 if hi <= np.iinfo(np.uint8).max else np.uint16)
+
+    @classmethod
+    def random(cls, num_neurons: int, connections: Tuple[int, int] = (10, 100),
+               max_delay: int = 1, rng: Optional[np.random.Generator] = None):
+        """随机连接：每个神经元 min~max 条输出突触，80%兴奋，20%抑制"""
+        return ConnectomeGenerator(rng).random(num_neurons, connections, max_delay)
+
+    @classmethod
+    def from_synapses(cls, synapses: List[Synapse], num_neurons: int):
+        """从 Synapse 对象列表转换"""
+        source = np.fromiter((s.source_id for s in synapses), dtype=np.int64, count=len(synapses))
+        order = np.argsort(source, kind='stable')
+        indptr = np.zeros(num_neurons + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source, minlength=num_neurons), out=indptr[1:])
+        target = np.fromiter((s.target_id for s in synapses), dtype=np.int64, count=len(synapses))
+        weight = np.fromiter((s.weight for s in synapses), dtype=np.float64, count=len(synapses))
+        inhibitory = np.fromiter((s.type == 'inhibitory' for s in synapses), dtype=bool,
+                                 count=len(synapses))
+        plasticity = synapses[0].plasticity if synapses else 0.01
+        return cls(num_neurons, indptr, target[order], weight[order], inhibitory[order],
+                   plasticity=plasticity)
+
+    @classmethod
+    def from_cpu(cls, cpu: 'BiologicalNeuronCPU'):
+        """复制 BiologicalNeuronCPU 的突触矩阵（之后各自学习，互不影响）"""
+        m = cpu.synapses
+        return cls(m.num_neurons, m.indptr.copy(), m.indices.copy(), m.weight.copy(),
+                   m.inhibitory(np.arange(len(m))), delay=None if m.delay is None else m.delay.copy(),
+                   plasticity=m.plasticity, num_targets=m.num_targets)
+
+    def save(self, path: str, generator: Optional[Dict] = None):
+        """保存为目录下的 .npy 文件，可用 load() 内存映射加载；generator 记录生成参数"""
+        import json
+        import os
+
+        os.makedirs(path, exist_ok=True)
+        arrays = {'indptr': self.indptr, 'indices': self.indices,
+                  'weight': self.weight, 'sign': self.sign}
+        if self.delay is not None:
+            arrays['delay'] = self.delay
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f'{name}.npy'), array)
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'num_neurons': self.num_neurons, 'num_targets': self.num_targets,
+                       'num_synapses': len(self), 'plasticity': self.plasticity,
+                       'generator': generator}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """
+        从 save() 的目录加载
+
+        mmap=True 时数组以写时复制方式内存映射：加载几乎瞬时，
+        学习修改的权重只留在内存中，不会写回文件。
+        """
+        import json
+        import os
+
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        mode = 'c' if mmap else None
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode)
+                  for name in ('indptr', 'indices', 'weight', 'sign')}
+        delay_path = os.path.join(path, 'delay.npy')
+        delay = np.load(delay_path, mmap_mode=mode) if os.path.exists(delay_path) else None
+        matrix = cls(meta['num_neurons'], arrays['indptr'], arrays['indices'], arrays['weight'],
+                     inhibitory=np.zeros(0, dtype=bool), delay=delay,
+                     plasticity=meta['plasticity'], num_targets=meta['num_targets'])
+        matrix.sign = arrays['sign']
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """突触存储占用字节数"""
+        total = self.indptr.nbytes + self.indices.nbytes + self.weight.nbytes + self.sign.nbytes
+        if self.delay is not None:
+            total += self.delay.nbytes
+        return total
+
+    def inhibitory(self, idx: np.ndarray) -> np.ndarray:
+        """读取若干突触的符号位"""
+        return ((self.sign[idx >> 3] >> (idx & 7).astype(np.uint8)) & 1).astype(bool)
+
+    def signed_weight(self, idx: np.ndarray) -> np.ndarray:
+        """带符号权重：兴奋为正，抑制为负（同 Synapse.transmit）"""
+        w = self.weight[idx]
+        return np.where(self.inhibitory(idx), -w, w)
+
+    def delays(self, idx: np.ndarray) -> np.ndarray:
+        if self.delay is None:
+            return np.ones(len(idx), dtype=np.uint8)
+        return self.delay[idx]
+
+    def output_synapses(self, neurons: np.ndarray) -> np.ndarray:
+        """若干源神经元的全部输出突触下标（CSR行切片）"""
+        return _csr_gather(self.indptr, np.asarray(neurons, dtype=np.int64))
+
+    def _build_transpose(self):
+        """按目标神经元分组的转置索引（首次访问输入突触时构建）"""
+        self._in_order = np.argsort(self.indices)
+        self._in_ptr = np.zeros(self.num_targets + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.num_targets), out=self._in_ptr[1:])
+        rows = np.repeat(np.arange(self.num_neurons, dtype=np.int32), np.diff(self.indptr))
+        self._in_source = rows[self._in_order]
+
+    def input_synapses(self, neurons: np.ndarray, with_sources: bool = False):
+        """若干目标神经元的全部输入突触下标（转置索引），可同时返回源神经元"""
+        if self._in_ptr is None:
+            self._build_transpose()
+        pos = _csr_gather(self._in_ptr, np.asarray(neurons, dtype=np.int64))
+        if with_sources:
+            return self._in_order[pos], self._in_source[pos]
+        return self._in_order[pos]
+
+    def propagate(self, fired: np.ndarray) -> np.ndarray:
+        """稀疏矩阵-向量乘：输入电流 = Wᵀ · spikes（fired 为发射神经元下标）"""
+        idx = self.output_synapses(fired)
+        return np.bincount(self.indices[idx], weights=self.signed_weight(idx),
+                           minlength=self.num_targets)
+
+    def partition(self, lo: int, hi: int) -> 'SynapseMatrix':
+        """
+        取出目标在 [lo, hi) 的突触，作为一个分片的路由表
+
+        行仍是全局源神经元ID（相当于SpiNNaker多播包的键），
+        列改为分片内的局部下标。
+        """
+        sel = np.flatnonzero((self.indices >= lo) & (self.indices < hi))
+        rows = np.repeat(np.arange(self.num_neurons), np.diff(self.indptr))[sel]
+        indptr = np.zeros(self.num_neurons + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.num_neurons), out=indptr[1:])
+        return SynapseMatrix(self.num_neurons, indptr, self.indices[sel] - lo,
+                             self.weight[sel], self.inhibitory(sel),
+                             plasticity=self.plasticity, num_targets=hi - lo)
+
+    def update_weights(self, idx: np.ndarray, delta):
+        """向量化权重更新（同 Synapse.update_weight，含可塑性系数与[0,1]截断）"""
+        w = self.weight[idx] + np.asarray(delta, dtype=np.float32) * np.float32(self.plasticity)
+        self.weight[idx] = np.clip(w, 0.0, 1.0)
+
+    def strengthen(self, neurons: np.ndarray, dopamine: float = 0.0):
+        """STRENGTHEN：增强若干神经元的全部输入突触（LTP）"""
+        self.update_weights(self.input_synapses(neurons), 0.1 * (1 + dopamine))
+
+    def weaken(self, neurons: np.ndarray):
+        """WEAKEN：削弱若干神经元的全部输入突触（LTD）"""
+        self.update_weights(self.input_synapses(neurons), -0.05)
+
+class SynapseView:
+    """CSR中一条突触的视图：接口同 Synapse，读写直接落到 SynapseMatrix 的数组上"""
+
+    __slots__ = ('matrix', 'index', 'source_id')
+
+    def __init__(self, matrix: SynapseMatrix, index: int, source_id: int):
+        self.matrix = matrix
+        self.index = index
+        self.source_id = source_id
+
+    @property
+    def target_id(self) -> int:
+        return int(self.matrix.indices[self.index])
+
+    @property
+    def weight(self) -> float:
+        return float(self.matrix.weight[self.index])
+
+    @weight.setter
+    def weight(self, value: float):
+        self.matrix.weight[self.index] = value
+
+    @property
+    def type(self) -> str:
+        inhibitory = (int(self.matrix.sign[self.index >> 3]) >> (self.index & 7)) & 1
+        return 'inhibitory' if inhibitory else 'excitatory'
+
+    @property
+    def plasticity(self) -> float:
+        return self.matrix.plasticity
+
+    transmit = Synapse.transmit
+
+    def update_weight(self, delta: float):
+        """更新权重（同 Synapse.update_weight）"""
+        self.matrix.update_weights(np.array([self.index]), delta)
+
+class SynapseSlice:
+    """一个神经元的全部输入或输出突触，按需生成 SynapseView"""
+
+    def __init__(self, matrix: SynapseMatrix, neuron_id: int, incoming: bool):
+        self.matrix = matrix
+        self.neuron_id = neuron_id
+        self.incoming = incoming
+
+    def _views(self) -> List[SynapseView]:
+        rows = np.array([self.neuron_id])
+        if self.incoming:
+            idx, sources = self.matrix.input_synapses(rows, with_sources=True)
+            return [SynapseView(self.matrix, i, s) for i, s in zip(idx.tolist(), sources.tolist())]
+        return [SynapseView(self.matrix, i, self.neuron_id)
+                for i in self.matrix.output_synapses(rows).tolist()]
+
+    def __len__(self) -> int:
+        if self.incoming:
+            if self.matrix._in_ptr is None:
+                self.matrix._build_transpose()
+            ptr = self.matrix._in_ptr
+        else:
+            ptr = self.matrix.indptr
+        return int(ptr[self.neuron_id + 1] - ptr[self.neuron_id])
+
+    def __iter__(self):
+        return iter(self._views())
+
+    def __getitem__(self, k):
+        return self._views()[k]
+
+class ConnectomeGenerator:
+    """
+    向量化连接组生成器
+
+    用 NumPy Generator 一次性抽取度数、目标、类型和权重，
+    替代 _create_random_connections 中逐突触的 random.sample：
+    - random:      每个神经元 min~max 条随机输出突触，同一行内无重复目标、无自环
+    - distance:    神经元排在1D环或2D环面上，目标按高斯距离抽取，延迟随距离增长
+    - small_world: Watts-Strogatz，环上 k 近邻 + 概率 p 重连
+    所有拓扑都是 80%兴奋 / 20%抑制，权重 U(0.1, 0.9)。
+    """
+
+    TOPOLOGIES = ('random', 'distance', 'small_world')
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def _assemble(self, num_neurons: int, degrees: np.ndarray, targets: np.ndarray,
+                  delay: Optional[np.ndarray] = None) -> SynapseMatrix:
+        indptr = np.zeros(num_neurons + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        total = len(targets)
+        return SynapseMatrix(num_neurons, indptr, targets,
+                             weight=self.rng.uniform(0.1, 0.9, size=total).astype(np.float32),
+                             inhibitory=self.rng.random(total, dtype=np.float32) < 0.2,
+                             delay=delay)
+
+    def random(self, num_neurons: int, connections: Tuple[int, int] = (10, 100),
+               max_delay: int = 1) -> SynapseMatrix:
+        """
+        均匀随机连接：每行不放回地抽取目标（同 random.sample），并排除自身
+
+        度数超过 num_neurons-1 时截断为 num_neurons-1。
+        """
+        min_conn, max_conn = connections
+        degrees = self.rng.integers(min_conn, max_conn + 1, size=num_neurons)
+        np.minimum(degrees, max(num_neurons - 1, 0), out=degrees)
+        total = int(degrees.sum())
+        sources = np.repeat(np.arange(num_neurons, dtype=np.int64), degrees)
+        targets = self._draw_targets(num_neurons, sources, np.arange(total))
+        # 拒绝采样：同一行内重复的目标重抽，直到没有重复
+        while True:
+            key = sources * num_neurons + targets
+            order = np.argsort(key, kind='stable')
+            dup = order[1:][key[order[1:]] == key[order[:-1]]]
+            if len(dup) == 0:
+                break
+            targets[dup] = self._draw_targets(num_neurons, sources, dup)
+        delay = self.rng.integers(1, max_delay + 1, size=total) if max_delay > 1 else None
+        return self._assemble(num_neurons, degrees, targets.astype(np.int32), delay)
+
+    def _draw_targets(self, num_neurons: int, sources: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """给 sources[idx] 各抽一个均匀分布且不等于自身的目标"""
+        targets = self.rng.integers(0, num_neurons - 1, size=len(idx))
+        return targets + (targets >= sources[idx])
+
+    def distance(self, num_neurons: int, connections: Tuple[int, int] = (10, 100),
+                 sigma: float = 10.0, dims: int = 2, max_delay: int = 1) -> SynapseMatrix:
+        """
+        距离依赖连接：偏移 ~ N(0, σ²)（单位：神经元间距），延迟 ∝ 距离
+
+        dims=2 时神经元排成 side×side 的环面，num_neurons 必须是完全平方数。
+        """
+        if dims not in (1, 2):
+            raise ValueError(f"距离拓扑只支持 dims=1 或 2，得到 {dims}")
+        if dims == 2 and math.isqrt(num_neurons) ** 2 != num_neurons:
+            raise ValueError(f"2D距离拓扑需要完全平方数个神经元，得到 {num_neurons}")
+        min_conn, max_conn = connections
+        degrees = self.rng.integers(min_conn, max_conn + 1, size=num_neurons)
+        total = int(degrees.sum())
+        sources = np.repeat(np.arange(num_neurons, dtype=np.int64), degrees)
+        offsets = np.rint(self.rng.normal(0.0, sigma, size=(total, dims))).astype(np.int64)
+        if dims == 1:
+            targets = (sources + offsets[:, 0]) % num_neurons
+        else:
+            side = math.isqrt(num_neurons)
+            x = (sources % side + offsets[:, 0]) % side
+            y = (sources // side + offsets[:, 1]) % side
+            targets = y * side + x
+        delay = None
+        if max_delay > 1:
+            dist = np.sqrt((offsets.astype(np.float32) ** 2).sum(axis=1))
+            delay = np.minimum(1 + (dist / (3 * sigma) * (max_delay - 1)).astype(np.int64),
+                               max_delay)
+        return self._assemble(num_neurons, degrees, targets.astype(np.int32), delay)
+
+    def small_world(self, num_neurons: int, k: int = 20, p: float = 0.1) -> SynapseMatrix:
+        """Watts-Strogatz小世界：连接左右各 k/2 个近邻，每条边以概率 p 重连到随机目标"""
+        half = k // 2
+        offsets = np.concatenate([np.arange(-half, 0), np.arange(1, half + 1)])
+        sources = np.arange(num_neurons, dtype=np.int64)[:, None]
+        targets = ((sources + offsets) % num_neurons).ravel()
+        rewire = self.rng.random(len(targets)) < p
+        targets[rewire] = self.rng.integers(0, num_neurons, size=int(rewire.sum()))
+        degrees = np.full(num_neurons, len(offsets))
+        return self._assemble(num_neurons, degrees, targets.astype(np.int32))
+
+    def build(self, topology: str, num_neurons: int, cache_path: Optional[str] = None,
+              **kwargs) -> SynapseMatrix:
+        """
+        按拓扑名生成；给定 cache_path 时优先内存映射加载，否则生成后保存
+
+        缓存的 meta.json 记录拓扑、规模和（补全默认值后的）生成参数，
+        与本次请求不一致时报错，而不是返回别的连接组。
+        """
+        import inspect
+        import json
+        import os
+
+        if topology not in self.TOPOLOGIES:
+            raise ValueError(f"未知拓扑: {topology}，可选: {self.TOPOLOGIES}")
+        method = getattr(self, topology)
+        bound = inspect.signature(method).bind(num_neurons, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        del params['num_neurons']
+        generator = json.loads(json.dumps({'topology': topology, 'num_neurons': num_neurons,
+                                           'params': params}))
+        meta_path = None if cache_path is None else os.path.join(cache_path, 'meta.json')
+        if meta_path is not None and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                cached = json.load(f).get('generator')
+            if cached != generator:
+                raise ValueError(f"缓存 {cache_path} 的连接组参数 {cached} 与请求 {generator} 不一致")
+            return SynapseMatrix.load(cache_path)
+        matrix = method(num_neurons, **kwargs)
+        if cache_path is not None:
+            matrix.save(cache_path, generator)
+        return matrix
+
+class STDPRule:
+    """
+    脉冲时间依赖可塑性 (STDP) - 基于指数迹
+
+    每个神经元维护突触前迹 x 和突触后迹 y，只在自身发射时更新，
+    其余时间按 exp(-Δt/τ) 解析衰减：
+    - 突触后神经元发射：输入突触 w += A+ · x_pre  (LTP，先前后后)
+    - 突触前神经元发射：输出突触 w -= A- · y_post (LTD，先后后前)
+    更新量乘以突触后神经元的 (1 + dopamine)，由多巴胺门控（同 Neuron._strengthen_synapses），
+    LTP 和 LTD 一样。
+    每步开销只与发射神经元的突触数成正比。
+    """
+
+    def __init__(self, num_neurons: int, a_plus: float = 0.1, a_minus: float = 0.05,
+                 tau_plus: float = 20.0, tau_minus: float = 20.0):
+        self.a_plus = a_plus      # 幅度沿用 STRENGTHEN / WEAKEN
+        self.a_minus = a_minus
+        self.tau_plus = tau_plus
+        self.tau_minus = tau_minus
+        self.pre_trace = np.zeros(num_neurons, dtype=np.float32)
+        self.post_trace = np.zeros(num_neurons, dtype=np.float32)
+        self.trace_time = np.zeros(num_neurons, dtype=np.int64)
+
+    def pre_at(self, ids: np.ndarray, t: int) -> np.ndarray:
+        """突触前迹在时间步 t 的值"""
+        return self.pre_trace[ids] * np.exp(-(t - self.trace_time[ids]) / self.tau_plus)
+
+    def post_at(self, ids: np.ndarray, t: int) -> np.ndarray:
+        """突触后迹在时间步 t 的值"""
+        return self.post_trace[ids] * np.exp(-(t - self.trace_time[ids]) / self.tau_minus)
+
+    def _record(self, fired: np.ndarray, t: int):
+        """发射神经元的两条迹衰减到 t 后加1"""
+        self.pre_trace[fired] = self.pre_at(fired, t) + 1.0
+        self.post_trace[fired] = self.post_at(fired, t) + 1.0
+        self.trace_time[fired] = t
+
+    def apply(self, t: int, fired: np.ndarray, synapses: SynapseMatrix, dopamine: np.ndarray):
+        """CSR突触：对本步发射神经元的输入/输出突触做STDP"""
+        if len(fired) == 0:
+            return
+        gate = 1.0 + dopamine
+        # LTP：发射神经元作为突触后
+        idx, pre = synapses.input_synapses(fired, with_sources=True)
+        if len(idx):
+            post = synapses.indices[idx]
+            synapses.update_weights(idx, self.a_plus * self.pre_at(pre, t) * gate[post])
+        # LTD：发射神经元作为突触前
+        idx = synapses.output_synapses(fired)
+        if len(idx):
+            post = synapses.indices[idx]
+            synapses.update_weights(idx, -self.a_minus * self.post_at(post, t) * gate[post])
+        self._record(fired, t)
+
+class SpikeRecorder:
+    """
+    流式脉冲栅格记录器
+
+    (时间步, 神经元ID) 写入定长 uint32 缓冲区，满一块就压缩写盘：
+    - 时间：与上一个脉冲的差值（同一步内为0）
+    - 神经元ID：同一步内与上一个ID的差值，每步首个存原值
+    - 两列各自按字节重排（shuffle）后 zlib 压缩
+    每块带头部（时间范围、ID范围、字节数），读取时可按块跳过。
+    """
+
+    MAGIC = b'SPKR0001'
+    CHUNK_HEADER = struct.Struct('<QQQIIII')  # t_first, t_last, 脉冲数, id_min, id_max, 两列字节数
+
+    def __init__(self, path: str, chunk_spikes: int = 1 << 20, level: int = 6):
+        self.path = path
+        self.level = level
+        self._file = open(path, 'wb')
+        self._file.write(self.MAGIC)
+        self._times = np.empty(chunk_spikes, dtype=np.uint32)
+        self._ids = np.empty(chunk_spikes, dtype=np.uint32)
+        self._count = 0
+        self._last_t = -1      # 上一次 record 的时间步
+        self._step_start = 0   # 该时间步在缓冲区中的起点
+        self.total_spikes = 0
+
+    def record(self, t: int, fired: np.ndarray):
+        """
+        追加一个时间步的发射神经元
+
+        t 必须单调不减（差分编码不能回退）；同一 t 多次调用时与缓冲区中该步的脉冲合并排序。
+        """
+        t = int(t)
+        if t < self._last_t or t > np.iinfo(np.uint32).max:
+            raise ValueError(f"时间步必须单调不减且在 uint32 范围内：上一步 {self._last_t}，得到 {t}")
+        fired = np.sort(np.asarray(fired, dtype=np.uint32))
+        if t == self._last_t:
+            fired = np.sort(np.concatenate([self._ids[self._step_start:self._count], fired]))
+            self._count = self._step_start
+        else:
+            self._last_t = t
+            self._step_start = self._count
+        while len(fired):
+            room = len(self._times) - self._count
+            part, fired = fired[:room], fired[room:]
+            end = self._count + len(part)
+            self._times[self._count:end] = t
+            self._ids[self._count:end] = part
+            self._count = end
+            if self._count == len(self._times):
+                self.flush()
+
+    @staticmethod
+    def _pack(values: np.ndarray, level: int) -> bytes:
+        shuffled = values.view(np.uint8).reshape(-1, 4).T.copy()
+        return zlib.compress(shuffled.tobytes(), level)
+
+    def flush(self):
+        """把当前缓冲区编码为一个块写盘"""
+        n = self._count
+        if n == 0:
+            return
+        times, ids = self._times[:n], self._ids[:n]
+        new_step = np.empty(n, dtype=bool)
+        new_step[0] = True
+        new_step[1:] = times[1:] != times[:-1]
+        dt = np.diff(times, prepend=times[:1])
+        did = np.diff(ids, prepend=np.uint32(0))
+        did[new_step] = ids[new_step]
+        t_blob = self._pack(dt, self.level)
+        id_blob = self._pack(did, self.level)
+        self._file.write(self.CHUNK_HEADER.pack(int(times[0]), int(times[-1]), n,
+                                                int(ids.min()), int(ids.max()),
+                                                len(t_blob), len(id_blob)))
+        self._file.write(t_blob)
+        self._file.write(id_blob)
+        self.total_spikes += n
+        self._count = 0
+        self._step_start = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SpikeRasterReader:
+    """
+    读取 SpikeRecorder 文件
+
+    打开时只扫描块头部，查询时只解压与时间窗口/神经元子集相交的块。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.chunks = []  # (数据偏移, t_first, t_last, 脉冲数, id_min, id_max, 两列字节数)
+        header = SpikeRecorder.CHUNK_HEADER
+        with open(path, 'rb') as f:
+            if f.read(len(SpikeRecorder.MAGIC)) != SpikeRecorder.MAGIC:
+                raise ValueError(f"不是脉冲栅格文件: {path}")
+            while True:
+                raw = f.read(header.size)
+                if len(raw) < header.size:
+                    break
+                fields = header.unpack(raw)
+                self.chunks.append((f.tell(),) + fields)
+                f.seek(fields[5] + fields[6], 1)
+
+    def __len__(self) -> int:
+        return sum(chunk[3] for chunk in self.chunks)
+
+    @staticmethod
+    def _unpack(blob: bytes, n: int) -> np.ndarray:
+        shuffled = np.frombuffer(zlib.decompress(blob), dtype=np.uint8).reshape(4, n)
+        return shuffled.T.copy().view(np.uint32).ravel()
+
+    def _decode(self, f, chunk) -> Tuple[np.ndarray, np.ndarray]:
+        offset, t_first, _, n, _, _, t_bytes, id_bytes = chunk
+        f.seek(offset)
+        dt = self._unpack(f.read(t_bytes), n)
+        did = self._unpack(f.read(id_bytes), n)
+        times = np.cumsum(dt, dtype=np.int64)
+        times += t_first - times[0]
+        # 分段前缀和还原ID：每步从首个ID重新累加
+        new_step = np.empty(n, dtype=bool)
+        new_step[0] = True
+        new_step[1:] = dt[1:] != 0
+        running = np.cumsum(did, dtype=np.int64)
+        starts = np.flatnonzero(new_step)
+        base = running[starts] - did[starts]
+        ids = running - np.repeat(base, np.diff(np.append(starts, n)))
+        return times, ids
+
+    def query(self, t_start: int = 0, t_end: Optional[int] = None,
+              neurons: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """返回 [t_start, t_end) 内（可选：指定神经元）的 (时间步, 神经元ID)"""
+        if neurons is not None:
+            neurons = np.unique(np.asarray(neurons, dtype=np.int64))
+        times_out, ids_out = [], []
+        with open(self.path, 'rb') as f:
+            for chunk in self.chunks:
+                _, t_first, t_last, _, id_min, id_max, _, _ = chunk
+                if t_last < t_start or (t_end is not None and t_first >= t_end):
+                    continue
+                if neurons is not None and (len(neurons) == 0 or neurons[-1] < id_min
+                                            or neurons[0] > id_max):
+                    continue
+                times, ids = self._decode(f, chunk)
+                keep = times >= t_start
+                if t_end is not None:
+                    keep &= times < t_end
+                if neurons is not None:
+                    keep &= np.isin(ids, neurons)
+                times_out.append(times[keep])
+                ids_out.append(ids[keep])
+        if not times_out:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(times_out), np.concatenate(ids_out)
+
+class EventDrivenNeuronCPU:
+    """
+    事件驱动神经元CPU
+
+    与 BiologicalNeuronCPU 相同的LIF动力学，但只处理真实发生的脉冲：
+    - 脉冲进入按延迟分桶的环形队列
+    - 只有被脉冲命中的神经元才累加输入
+    - 静息神经元不逐步更新，按上次更新时间解析衰减：
+      V(t) = V_rest + (V0 - V_rest) * (1 - leak)^Δt
+    每步开销 ∝ 脉冲流量，而不是网络规模。
+    """
+
+    REFRACTORY_STEPS = 5  # 与 Neuron._fire 相同的5ms不应期
+
+    def __init__(self, num_neurons=1000, connections: Tuple[int, int] = (10, 100),
+                 max_delay: int = 1, seed: Optional[int] = None,
+                 synapses: Optional[SynapseMatrix] = None, stdp: Optional[STDPRule] = None,
+                 recorder: Optional[SpikeRecorder] = None):
+        self.rng = np.random.default_rng(seed)
+        self.stdp = stdp
+        self.recorder = recorder
+        if synapses is None:
+            synapses = SynapseMatrix.random(num_neurons, connections, max_delay, self.rng)
+        self.synapses = synapses
+        self.num_neurons = num_neurons = synapses.num_neurons
+        self.time_step = 0
+        if synapses.delay is not None and len(synapses):
+            max_delay = max(max_delay, int(synapses.delay.max()))
+        self.max_delay = max_delay
+
+        # 神经元状态（与 Neuron 默认参数一致）
+        template = Neuron(id=-1)
+        self.resting_potential = template.resting_potential
+        self.leak_rate = template.leak_rate
+        self.membrane_potential = np.full(num_neurons, template.membrane_potential)
+        self.threshold = np.full(num_neurons, template.threshold)
+        self.dopamine = np.zeros(num_neurons)
+        self.last_update = np.zeros(num_neurons, dtype=np.int64)       # 电位对应的时间步
+        self.refractory_until = np.zeros(num_neurons, dtype=np.int64)  # 可再次积分的时间步
+
+        # 延迟分桶队列：bucket[t % (max_delay+1)] = [(targets, currents), ...]
+        self._spike_queue: List[List[Tuple[np.ndarray, np.ndarray]]] = [
+            [] for _ in range(max_delay + 1)
+        ]
+        self._stimulated: Dict[int, None] = {}
+
+    @property
+    def total_synapses(self) -> int:
+        return len(self.synapses)
+
+    def _decayed(self, ids: np.ndarray, t: int) -> np.ndarray:
+        """解析衰减：电位从 last_update 推进到时间步 t（不写回）"""
+        elapsed = np.maximum(t - self.last_update[ids], 0)
+        keep = (1.0 - self.leak_rate) ** elapsed
+        rest = self.resting_potential
+        return rest + (self.membrane_potential[ids] - rest) * keep
+
+    def _enqueue(self, fired: np.ndarray, t: int):
+        """把发射神经元的所有输出突触放入对应延迟的桶"""
+        idx = self.synapses.output_synapses(fired)
+        if len(idx) == 0:
+            return
+        targets = self.synapses.indices[idx]
+        currents = self.synapses.signed_weight(idx)
+        size = len(self._spike_queue)
+        if self.max_delay == 1:
+            self._spike_queue[(t + 1) % size].append((targets, currents))
+            return
+        delays = self.synapses.delays(idx)
+        for d in range(1, self.max_delay + 1):
+            mask = delays == d
+            if mask.any():
+                self._spike_queue[(t + d) % size].append((targets[mask], currents[mask]))
+
+    def step(self) -> int:
+        """执行一个时间步（1ms），只访问收到脉冲或外部刺激的神经元"""
+        t = self.time_step
+        bucket = self._spike_queue[t % len(self._spike_queue)]
+        self._spike_queue[t % len(self._spike_queue)] = []
+
+        # 1. 累加本步到达的突触输入
+        if bucket:
+            targets = np.concatenate([b[0] for b in bucket])
+            currents = np.concatenate([b[1] for b in bucket])
+            ids, inverse = np.unique(targets, return_inverse=True)
+            inputs = np.bincount(inverse, weights=currents)
+        else:
+            ids = np.empty(0, dtype=np.int64)
+            inputs = np.empty(0)
+        stim = None
+        if self._stimulated:
+            stim = np.fromiter(self._stimulated, dtype=np.int64)
+            self._stimulated = {}
+            extra = np.setdiff1d(stim, ids, assume_unique=True)
+            ids = np.concatenate([ids, extra])
+            inputs = np.concatenate([inputs, np.zeros(len(extra))])
+
+        spike_count = 0
+        if len(ids):
+            # 2. 不应期内的神经元丢弃输入（同 Neuron._integrate）；
+            #    外部刺激的电荷已经加到电位上，留在刺激集合里等不应期结束再检查
+            active = self.refractory_until[ids] <= t
+            if stim is not None and not active.all():
+                waiting = ids[~active]
+                waiting = waiting[np.isin(waiting, stim, assume_unique=True)]
+                self._stimulated.update(dict.fromkeys(waiting.tolist()))
+            ids, inputs = ids[active], inputs[active]
+
+            # 3. 解析衰减到 t-1，再做第 t 步的积分与漏电
+            rest = self.resting_potential
+            v = self._decayed(ids, t - 1) + inputs
+            v -= (v - rest) * self.leak_rate
+            self.membrane_potential[ids] = v
+            self.last_update[ids] = t
+
+            # 4. 发射
+            fired = ids[v >= self.threshold[ids]]
+            spike_count = len(fired)
+            if spike_count:
+                self.membrane_potential[fired] = rest
+                self.refractory_until[fired] = t + self.REFRACTORY_STEPS + 1
+                self.last_update[fired] = t + self.REFRACTORY_STEPS
+                self._enqueue(fired, t)
+                if self.stdp is not None:
+                    self.stdp.apply(t, fired, self.synapses, self.dopamine)
+                if self.recorder is not None:
+                    self.recorder.record(t, fired)
+
+        # 5. 自适应（每100ms，需要全体当前电位，摊销 O(N/100)）
+        if t % 100 == 0:
+            self._adapt(t)
+
+        self.time_step += 1
+        return spike_count
+
+    def _adapt(self, t: int):
+        """阈值自适应（同 Neuron._adapt）"""
+        v = self._decayed(np.arange(self.num_neurons), t)
+        excited = v > self.threshold * 0.9
+        self.threshold += np.where(excited, 0.1, -0.05)
+        self._recheck(v)
+
+    def _recheck(self, v: np.ndarray):
+        """
+        阈值变化后，电位已越过新阈值的神经元即使没有输入也要在下一步检查发射
+
+        把它们并入外部刺激集合，下一步按零输入走积分/发射路径。
+        """
+        above = np.flatnonzero(v >= self.threshold)
+        if len(above):
+            self._stimulated.update(dict.fromkeys(above.tolist()))
+
+    def run(self, steps: int) -> List[int]:
+        """连续运行若干步，返回每步脉冲数"""
+        return [self.step() for _ in range(steps)]
+
+    def stimulate(self, neuron_ids: List[int], intensity: float = 1.0):
+        """外部刺激：先把电位推进到当前时刻，再注入"""
+        hits = np.asarray(neuron_ids, dtype=np.int64)
+        hits = hits[(hits >= 0) & (hits < self.num_neurons)]
+        if len(hits) == 0:
+            return
+        ids = np.unique(hits)
+        t = self.time_step - 1
+        self.membrane_potential[ids] = self._decayed(ids, t)
+        np.add.at(self.membrane_potential, hits, intensity * 20)
+        self.last_update[ids] = np.maximum(self.last_update[ids], t)
+        self._stimulated.update(dict.fromkeys(ids.tolist()))
+
+    def reward(self, dopamine: float = 1.0):
+        """奖励信号（多巴胺，同 Neuron._modulate）"""
+        self.dopamine[:] = dopamine
+        self.threshold += dopamine * 0.1
+        self._recheck(self._decayed(np.arange(self.num_neurons), self.time_step - 1))
+
+    def get_activity(self) -> Dict:
+        """获取网络活动统计（格式同 BiologicalNeuronCPU.get_activity）"""
+        v = self._decayed(np.arange(self.num_neurons), self.time_step - 1)
+        return {
+            'time': self.time_step,
+            'active_neurons': int(np.count_nonzero(v > self.threshold * 0.8)),
+            'avg_potential': float(v.mean()),
+            'total_synapses': self.total_synapses
+        }
+
+class VectorizedNeuronCPU:
+    """
+    向量化神经元CPU - 整个神经元群体一次更新
+
+    膜电位、阈值、不应期计数、漏电率、多巴胺都是 float32 数组，
+    一次 step() 用数组表达式完成 Neuron._integrate / _fire /
+    _refractory / _adapt 对全部神经元的处理（时钟驱动，1ms突触延迟）。
+    """
+
+    REFRACTORY_STEPS = 5
+
+    def __init__(self, num_neurons=1000, connections: Tuple[int, int] = (10, 100),
+                 seed: Optional[int] = None, synapses: Optional[SynapseMatrix] = None,
+                 stdp: Optional[STDPRule] = None, recorder: Optional[SpikeRecorder] = None):
+        self.rng = np.random.default_rng(seed)
+        self.stdp = stdp
+        self.recorder = recorder
+        if synapses is None:
+            synapses = SynapseMatrix.random(num_neurons, connections, rng=self.rng)
+        self.synapses = synapses
+        self.num_neurons = num_neurons = synapses.num_targets
+        self.time_step = 0
+
+        template = Neuron(id=-1)
+        self.resting_potential = np.float32(template.resting_potential)
+        self.membrane_potential = np.full(num_neurons, template.membrane_potential, dtype=np.float32)
+        self.threshold = np.full(num_neurons, template.threshold, dtype=np.float32)
+        self.refractory = np.zeros(num_neurons, dtype=np.float32)
+        self.leak_rate = np.full(num_neurons, template.leak_rate, dtype=np.float32)
+        self.dopamine = np.zeros(num_neurons, dtype=np.float32)
+        self.fired = np.empty(0, dtype=np.int64)  # 上一步发射的神经元
+
+    @classmethod
+    def from_cpu(cls, cpu: BiologicalNeuronCPU):
+        """从对象版 BiologicalNeuronCPU 复制突触和神经元状态"""
+        vec = cls(synapses=SynapseMatrix.from_cpu(cpu))
+        vec.time_step = cpu.time_step
+        for attr, field in (('membrane_potential', 'membrane_potential'),
+                            ('threshold', 'threshold'),
+                            ('refractory', 'refractory_period'),
+                            ('leak_rate', 'leak_rate'),
+                            ('dopamine', 'dopamine')):
+            getattr(vec, attr)[:] = [getattr(n, field) for n in cpu.neurons]
+        return vec
+
+    def step(self) -> int:
+        """执行一个时间步（1ms）"""
+        rest = self.resting_potential
+        v = self.membrane_potential
+
+        # 1. 接收 + 积分（不应期内跳过）
+        current = self.synapses.propagate(self.fired).astype(np.float32)
+        integrating = self.refractory == 0
+        v_new = v + current
+        v_new -= (v_new - rest) * self.leak_rate
+        np.copyto(v, v_new, where=integrating)
+
+        # 2. 不应期倒计时 + 发射
+        refractory = ~integrating
+        self.refractory[refractory] -= 1
+        fired_mask = integrating & (v >= self.threshold)
+        v[fired_mask] = rest
+        self.refractory[fired_mask] = self.REFRACTORY_STEPS
+        self.fired = np.flatnonzero(fired_mask)
+        if self.stdp is not None:
+            self.stdp.apply(self.time_step, self.fired, self.synapses, self.dopamine)
+        if self.recorder is not None and len(self.fired):
+            self.recorder.record(self.time_step, self.fired)
+
+        # 3. 自适应（每100ms）
+        if self.time_step % 100 == 0:
+            self.threshold += np.where(v > self.threshold * 0.9,
+                                       np.float32(0.1), np.float32(-0.05))
+
+        self.time_step += 1
+        return len(self.fired)
+
+    def run(self, steps: int) -> List[int]:
+        """连续运行若干步，返回每步脉冲数"""
+        return [self.step() for _ in range(steps)]
+
+    def stimulate(self, neuron_ids: List[int], intensity: float = 1.0):
+        """外部刺激"""
+        ids = np.asarray(neuron_ids, dtype=np.int64)
+        ids = ids[(ids >= 0) & (ids < self.num_neurons)]
+        np.add.at(self.membrane_potential, ids, np.float32(intensity * 20))
+
+    def reward(self, dopamine: float = 1.0):
+        """奖励信号（多巴胺，同 Neuron._modulate）"""
+        self.dopamine[:] = dopamine
+        self.threshold += np.float32(dopamine * 0.1)
+
+    def get_activity(self) -> Dict:
+        """获取网络活动统计（格式同 BiologicalNeuronCPU.get_activity）"""
+        v = self.membrane_potential
+        return {
+            'time': self.time_step,
+            'active_neurons': int(np.count_nonzero(v > self.threshold * 0.8)),
+            'avg_potential': float(v.mean(dtype=np.float64)),
+            'total_synapses': len(self.synapses)
+        }
+
+def _shard_worker(conn, shm_name: str, num_neurons: int, lo: int,
+                  synapses: SynapseMatrix, barrier, timeout: float):
+    """
+    分片工作进程：本地积分，通过共享内存位图交换脉冲
+
+    屏障等待带超时；超时、屏障被中止或本进程出错时，向主进程回复 ('error', 说明) 后退出。
+    """
+    import threading
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    nbytes = (num_neurons + 7) // 8
+    spike_bits = np.ndarray((2, nbytes), dtype=np.uint8, buffer=shm.buf)
+    local_bytes = slice(lo // 8, lo // 8 + (synapses.num_targets + 7) // 8)
+    cpu = VectorizedNeuronCPU(synapses=synapses)
+    try:
+        while True:
+            command, *args = conn.recv()
+            if command == 'run':
+                counts = np.zeros(args[0], dtype=np.int64)
+                for k in range(args[0]):
+                    t = cpu.time_step
+                    # 1. 读取上一步全网发射的神经元（多播包）
+                    bits = np.unpackbits(spike_bits[t % 2], count=num_neurons, bitorder='little')
+                    cpu.fired = np.flatnonzero(bits)
+                    # 2. 本地积分
+                    counts[k] = cpu.step()
+                    # 3. 发布本分片的发射位图
+                    mask = np.zeros(synapses.num_targets, dtype=bool)
+                    mask[cpu.fired] = True
+                    spike_bits[(t + 1) % 2, local_bytes] = np.packbits(mask, bitorder='little')
+                    barrier.wait(timeout)
+                conn.send(counts)
+            elif command == 'stimulate':
+                cpu.stimulate(args[0], args[1])
+            elif command == 'reward':
+                cpu.reward(args[0])
+            elif command == 'activity':
+                v = cpu.membrane_potential
+                conn.send((int(np.count_nonzero(v > cpu.threshold * 0.8)),
+                           float(v.sum(dtype=np.float64))))
+            elif command == 'stop':
+                break
+    except threading.BrokenBarrierError:
+        conn.send(('error', f"分片 {lo}: 第{cpu.time_step}步屏障超时或被中止"))
+    except Exception as exc:
+        barrier.abort()  # 让其他分片立即退出等待
+        conn.send(('error', f"分片 {lo}: {exc!r}"))
+    finally:
+        del spike_bits
+        shm.close()
+
+class PartitionedNeuronCPU:
+    """
+    多核分片神经元CPU（仿 SpiNNaker 多播路由）
+
+    - 神经元按连续区间分片，每个分片由一个工作进程拥有（≈ SpiNNaker的一个ARM核）
+    - 每步每个分片把发射神经元写入共享内存位图（≈ 多播脉冲包，键 = 源神经元ID）
+    - 其他分片读取位图，用自己的路由表（目标在本分片的突触）驱动输入
+    - 位图双缓冲 + 每步一次屏障同步
+    头号指标：实时因子 = 模拟ms / 墙钟ms（≥1 即实时）。
+    任一分片出错或退出时（屏障等待超过 timeout 秒也算），run 抛出 RuntimeError 并终止全部分片。
+    """
+
+    def __init__(self, num_neurons=100_000, num_shards: Optional[int] = None,
+                 connections: Tuple[int, int] = (10, 100), seed: Optional[int] = None,
+                 synapses: Optional[SynapseMatrix] = None, timeout: float = 30.0):
+        import multiprocessing as mp
+        from multiprocessing import shared_memory
+
+        if synapses is None:
+            synapses = SynapseMatrix.random(num_neurons, connections,
+                                            rng=np.random.default_rng(seed))
+        self.num_neurons = num_neurons = synapses.num_neurons
+        self.total_synapses = len(synapses)
+        self.num_shards = num_shards or mp.cpu_count()
+        self.time_step = 0
+        self.realtime_factor = 0.0
+
+        # 分片边界按8对齐，保证各分片写位图时互不重叠
+        chunk = -(-num_neurons // self.num_shards)
+        chunk = -(-chunk // 8) * 8
+        self.bounds = [(lo, min(lo + chunk, num_neurons)) for lo in range(0, num_neurons, chunk)]
+
+        self._shm = shared_memory.SharedMemory(create=True, size=2 * ((num_neurons + 7) // 8))
+        np.ndarray(self._shm.size, dtype=np.uint8, buffer=self._shm.buf)[:] = 0
+        barrier = mp.Barrier(len(self.bounds))
+        self._conns = []
+        self._workers = []
+        for lo, hi in self.bounds:
+            parent, child = mp.Pipe()
+            worker = mp.Process(target=_shard_worker, daemon=True,
+                                args=(child, self._shm.name, num_neurons, lo,
+                                      synapses.partition(lo, hi), barrier, timeout))
+            worker.start()
+            self._conns.append(parent)
+            self._workers.append(worker)
+
+    def run(self, steps: int) -> List[int]:
+        """所有分片同步运行若干步，返回每步全网脉冲数"""
+        import time
+
+        start = time.perf_counter()
+        self._send(('run', steps))
+        counts = sum(self._gather())
+        wall_ms = (time.perf_counter() - start) * 1000
+        self.realtime_factor = steps / wall_ms
+        self.time_step += steps
+        return counts.tolist()
+
+    def step(self) -> int:
+        return self.run(1)[0]
+
+    def stimulate(self, neuron_ids: List[int], intensity: float = 1.0):
+        """外部刺激：按分片拆分后发给拥有者"""
+        ids = np.asarray(neuron_ids, dtype=np.int64)
+        for (lo, hi), conn in zip(self.bounds, self._conns):
+            local = ids[(ids >= lo) & (ids < hi)] - lo
+            if len(local):
+                self._send(('stimulate', local, intensity), [conn])
+
+    def reward(self, dopamine: float = 1.0):
+        """奖励信号广播到所有分片"""
+        self._send(('reward', dopamine))
+
+    def get_activity(self) -> Dict:
+        """获取网络活动统计（格式同 BiologicalNeuronCPU.get_activity）"""
+        self._send(('activity',))
+        replies = self._gather()
+        return {
+            'time': self.time_step,
+            'active_neurons': sum(r[0] for r in replies),
+            'avg_potential': sum(r[1] for r in replies) / self.num_neurons,
+            'total_synapses': self.total_synapses
+        }
+
+    def _send(self, message, conns=None):
+        """发给全部（或指定）分片；工作进程已不在时终止全部分片并报错"""
+        if not self._workers:
+            raise RuntimeError("分片工作进程已终止")
+        for conn in self._conns if conns is None else conns:
+            try:
+                conn.send(message)
+            except (BrokenPipeError, OSError):
+                self._fail(f"无法向分片发送 {message[0]!r}：工作进程已退出")
+
+    def _gather(self) -> list:
+        """收集每个分片的回复；同时监视工作进程，出错或意外退出时终止全部分片"""
+        replies = [None] * len(self._conns)
+        pending = set(range(len(self._conns)))
+        while pending:
+            for i in sorted(pending):
+                conn, worker = self._conns[i], self._workers[i]
+                if conn.poll(0.05):
+                    try:
+                        reply = conn.recv()
+                    except EOFError:
+                        worker.join(timeout=1)
+                        self._fail(f"分片 {self.bounds[i][0]} 的工作进程已退出 (exitcode={worker.exitcode})")
+                    if isinstance(reply, tuple) and reply and reply[0] == 'error':
+                        self._fail(reply[1])
+                    replies[i] = reply
+                    pending.discard(i)
+                elif worker.exitcode is not None:
+                    self._fail(f"分片 {self.bounds[i][0]} 的工作进程已退出 (exitcode={worker.exitcode})")
+        return replies
+
+    def _fail(self, message: str):
+        """
+        终止全部分片，然后报错
+
+        不在主进程里 abort 屏障：被杀掉的分片可能正持有屏障内部的锁，abort 会永久阻塞。
+        """
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in self._workers:
+            worker.join(timeout=1)
+            if worker.is_alive():  # 被挂起的进程收不到 SIGTERM
+                worker.kill()
+                worker.join()
+        self._conns, self._workers = [], []
+        raise RuntimeError(f"分片运行失败: {message}")
+
+    def close(self):
+        """停止工作进程并释放共享内存"""
+        for conn in self._conns:
+            try:
+                conn.send(('stop',))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self._conns, self._workers = [], []
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def demonstrate_event_driven_engine():
+    """演示事件驱动引擎：稀疏大网络"""
+    import time
+
+    print("\n" + "=" * 80)
+    print("⚡ 事件驱动引擎 (Event-Driven Engine)")
+    print("=" * 80)
+
+    num_neurons = 1_000_000
+    start = time.perf_counter()
+    cpu = EventDrivenNeuronCPU(num_neurons=num_neurons, connections=(1, 10),
+                               max_delay=3, seed=42)
+    build = time.perf_counter() - start
+    print(f"\n✅ 创建稀疏网络: {num_neurons:,}个神经元, "
+          f"{cpu.total_synapses:,}个突触 ({build:.2f}s)")
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    total_spikes = 0
+    for t in range(100):
+        if t % 20 == 0:
+            cpu.stimulate(rng.integers(0, num_neurons, 10_000).tolist(), intensity=1.5)
+        total_spikes += cpu.step()
+    elapsed = time.perf_counter() - start
+    stats = cpu.get_activity()
+    print(f"   100ms模拟: {total_spikes:,}个脉冲, 耗时{elapsed:.2f}s, "
+          f"平均电位={stats['avg_potential']:6.2f}mV")
+    print("   开销随脉冲流量增长，而不是随神经元数量增长")
+
+    # CSR存储 vs Synapse对象
+    import sys
+    legacy = BiologicalNeuronCPU(num_neurons=1000)
+    sample = Synapse(source_id=0, target_id=1, weight=0.5, type='excitatory')
+    object_bytes = (sys.getsizeof(sample) + sys.getsizeof(sample.__dict__)
+                    + sys.getsizeof(sample.weight) + 2 * 8)  # 对象 + 属性字典 + 权重 + 两个列表引用
+    matrix = legacy.synapses
+    csr_bytes = matrix.nbytes / len(matrix)
+    print(f"\n✅ CSR突触存储: {len(matrix):,}个突触")
+    print(f"   Synapse对象: ~{object_bytes}字节/突触, CSR: {csr_bytes:.1f}字节/突触 "
+          f"(节省{object_bytes / csr_bytes:.0f}倍)")
+
+    # 向量化群体积分
+    vec = VectorizedNeuronCPU(num_neurons=100_000, seed=7)
+    start = time.perf_counter()
+    for t in range(100):
+        if t % 20 == 0:
+            vec.stimulate(rng.integers(0, 100_000, 1000).tolist(), intensity=1.5)
+        if t % 50 == 0 and t > 0:
+            vec.reward(dopamine=0.5)
+        vec.step()
+    elapsed = time.perf_counter() - start
+    stats = vec.get_activity()
+    print(f"\n✅ 向量化LIF: 100,000个神经元 × 100ms, 耗时{elapsed:.2f}s "
+          f"({100 * 100_000 / elapsed / 1e6:.0f}M 神经元·步/秒)")
+    print(f"   {stats['active_neurons']}个活跃神经元, 平均电位={stats['avg_potential']:6.2f}mV")
+
+    # STDP学习常开
+    stdp_cpu = VectorizedNeuronCPU(num_neurons=100_000, seed=7, stdp=STDPRule(100_000))
+    before = stdp_cpu.synapses.weight.copy()
+    start = time.perf_counter()
+    for t in range(100):
+        if t % 5 == 0:
+            stdp_cpu.stimulate(rng.integers(0, 100_000, 1000).tolist(), intensity=1.5)
+        stdp_cpu.step()
+    elapsed = time.perf_counter() - start
+    changed = int(np.count_nonzero(stdp_cpu.synapses.weight != before))
+    print(f"\n✅ STDP学习: 100ms耗时{elapsed:.2f}s（含首次转置索引构建）, "
+          f"{changed:,}/{len(before):,}条突触被更新")
+
+    # 向量化连接组生成 + 内存映射缓存
+    import tempfile
+    generator = ConnectomeGenerator(np.random.default_rng(11))
+    with tempfile.TemporaryDirectory() as cache:
+        start = time.perf_counter()
+        world = generator.build('small_world', 100_000, cache_path=cache, k=50, p=0.1)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        generator.build('small_world', 100_000, cache_path=cache, k=50, p=0.1)
+        loaded = time.perf_counter() - start
+    print(f"\n✅ 小世界连接组: 100,000个神经元, {len(world):,}个突触")
+    print(f"   生成{built:.2f}s（含保存）, 内存映射加载{loaded * 1000:.1f}ms")
+
+    # 流式脉冲栅格记录
+    import os
+    with tempfile.TemporaryDirectory() as folder:
+        raster = os.path.join(folder, 'spikes.spkr')
+        with SpikeRecorder(raster) as recorder:
+            for t in range(1000):
+                recorder.record(t, rng.choice(1_000_000, 2000, replace=False))
+        reader = SpikeRasterReader(raster)
+        size = os.path.getsize(raster)
+        times, ids = reader.query(400, 500, neurons=np.arange(0, 1_000_000, 10))
+    print(f"\n✅ 脉冲栅格: {len(reader):,}个脉冲, {size / 1e6:.1f}MB "
+          f"({size / len(reader):.2f}字节/脉冲, 原始8字节)")
+    print(f"   查询 t∈[400,500) × 10%神经元: {len(times):,}个脉冲")
+
+    # 多核分片（SpiNNaker式脉冲交换）
+    with PartitionedNeuronCPU(num_neurons=200_000, num_shards=4, seed=7) as part:
+        part.stimulate(rng.integers(0, 200_000, 5000).tolist(), intensity=1.5)
+        counts = part.run(100)
+        print(f"\n✅ 分片模拟: 200,000个神经元 / {len(part.bounds)}个分片, "
+              f"100ms共{sum(counts):,}个脉冲")
+        print(f"   实时因子 = {part.realtime_factor:.2f} (模拟ms / 墙钟ms)")
+
 def demonstrate_biological_neuron_cpu():
     """演示生物神经元CPU"""
     print("=" * 80)
@@ -433,3 +1661,4 @@ def demonstrate_biological_neuron_cpu():
 
 if __name__ == "__main__":
     demonstrate_biological_neuron_cpu()
+    demonstrate_event_driven_engine()
@@ -139,6 +139,7 @@ class ChronosState:
     earlier: bool = False  # 时间比较结果
     coincide: bool = False  # 重合标志
     timeout: bool = False  # 超时标志
+    halted: bool = False  # 停机标志
 
 class ChronosCPU:
     """Chronos CPU实现"""
@@ -150,14 +151,223 @@ class ChronosCPU:
             freq_registers=[1e9 for _ in range(4)]  # 默认1GHz
         )
         self.memory = []  # 循环延迟线存储
+        # 指令 → 处理函数，只解析一次
+        self.dispatch = {ins: getattr(self, f"_exec_{ins.name.lower()}")
+                         for ins in ChronosInstruction if hasattr(self, f"_exec_{ins.name.lower()}")}
+        self.program = []
+        self._ops = []
+        self._regs = None
         
     def execute(self, instruction: ChronosInstruction, *args):
         """执行指令"""
-        method_name = f"_exec_{instruction.name.lower()}"
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(*args)
+        handler = self.dispatch.get(instruction)
+        if handler is not None:
+            return handler(*args)
         return f"执行: {instruction.value}"
     
+    # === 程序执行 ===
+    
+    def load(self, program):
+        """
+        加载程序：[(指令, 参数...), ...]
+
+        装载时把每条指令预解析成闭包 op(pc) → 下一个pc，
+        闭包直接读写浮点寄存器（皮秒），热循环中不创建 TimeValue、不格式化字符串。
+        装载会把 pc 复位到 0 并清除停机标志；没有 _exec_* 实现的指令直接报错，
+        避免快速模式与调试模式行为不一致。
+        """
+        t, ph, fr = [0.0] * len(self.state.time_registers), [], []
+        flags = [False, False]  # earlier, coincide
+        wait = [0.0]            # WAIT/NOP 累计的物理延迟（皮秒）
+        self._regs = (t, ph, fr, flags, wait)
+        table = self._op_table(t, ph, fr, flags, wait)
+        self.program = [tuple(line) for line in program]
+        self.state.pc = 0
+        self.state.halted = False
+        self._ops = []
+        for pc, (instruction, *args) in enumerate(self.program):
+            factory = table.get(instruction)
+            if factory is None or instruction not in self.dispatch:
+                raise ValueError(f"第{pc}条指令 {instruction.name} 尚未实现，不能装入程序")
+            self._ops.append(factory(*args))
+        return self
+    
+    @staticmethod
+    def _op_table(t, ph, fr, flags, wait):
+        """指令 → 闭包工厂（与 _exec_* 语义一致）"""
+        I = ChronosInstruction
+        
+        def delay(reg, picoseconds):
+            picoseconds = float(picoseconds)
+            def op(pc):
+                t[reg] = picoseconds
+                return pc + 1
+            return op
+        
+        def binary(fn):
+            def factory(a, b, r):
+                def op(pc):
+                    t[r] = fn(t[a], t[b])
+                    return pc + 1
+                return op
+            return factory
+        
+        def scaled(fn):
+            def factory(reg, k, r):
+                def op(pc):
+                    t[r] = fn(t[reg], k)
+                    return pc + 1
+                return op
+            return factory
+        
+        def measure(start, stop, r):
+            def op(pc):
+                t[r] = t[stop] - t[start]
+                return pc + 1
+            return op
+        
+        def phase_shift(reg, degrees):
+            def op(pc):
+                ph[reg] = (ph[reg] + degrees) % 360
+                return pc + 1
+            return op
+        
+        def invert_phase(reg):
+            def op(pc):
+                ph[reg] = (ph[reg] + 180) % 360
+                return pc + 1
+            return op
+        
+        def set_freq(reg, freq_hz):
+            def op(pc):
+                fr[reg] = freq_hz
+                return pc + 1
+            return op
+        
+        def freq_to_time(freq_reg, time_reg):
+            def op(pc):
+                t[time_reg] = 1e12 / fr[freq_reg]
+                return pc + 1
+            return op
+        
+        def time_to_freq(time_reg, freq_reg):
+            def op(pc):
+                fr[freq_reg] = 1e12 / t[time_reg]
+                return pc + 1
+            return op
+        
+        def race(a, b):
+            def op(pc):
+                flags[0] = t[a] < t[b]
+                return pc + 1
+            return op
+        
+        def coincide(a, b, tolerance_ps):
+            def op(pc):
+                flags[1] = abs(t[a] - t[b]) < tolerance_ps
+                return pc + 1
+            return op
+        
+        def branch_time(a, b, target):
+            def op(pc):
+                return target if t[a] < t[b] else pc + 1
+            return op
+        
+        def wait_reg(reg):
+            def op(pc):
+                wait[0] += t[reg]
+                return pc + 1
+            return op
+        
+        def nop(delay_ps=0.0):
+            def op(pc):
+                wait[0] += delay_ps
+                return pc + 1
+            return op
+        
+        def no_effect(*args):
+            return lambda pc: pc + 1
+        
+        def halt():
+            return lambda pc: ~(pc + 1)  # 负数表示停机，~ 还原出下一条的pc
+        
+        return {
+            I.DELAY: delay,
+            I.PULSE: no_effect,
+            I.MEASURE: measure,
+            I.ADD_DELAY: binary(lambda x, y: x + y),
+            I.SUB_DELAY: binary(lambda x, y: x - y),
+            I.MUL_DELAY: scaled(lambda x, k: x * k),
+            I.DIV_DELAY: scaled(lambda x, k: x / k),
+            I.PHASE_SHIFT: phase_shift,
+            I.PHASE_DETECT: no_effect,
+            I.INVERT_PHASE: invert_phase,
+            I.SET_FREQ: set_freq,
+            I.FREQ_TO_TIME: freq_to_time,
+            I.TIME_TO_FREQ: time_to_freq,
+            I.RACE: race,
+            I.COINCIDE: coincide,
+            I.WINDOW: no_effect,
+            I.BRANCH_TIME: branch_time,
+            I.WAIT: wait_reg,
+            I.NOP: nop,
+            I.HALT: halt,
+        }
+    
+    def run(self, max_steps=10**8, debug=False, gate_delay_ps=10.0):
+        """
+        从 state.pc 开始运行已加载的程序，直到 HALT、pc 越界或达到 max_steps
+
+        debug=True 时逐条走 execute()，返回每条指令的文字记录（慢，用于调试）；
+        否则走预解析的闭包。模拟时钟 = 每条指令 gate_delay_ps + WAIT/NOP 的延迟。
+        返回 {'steps', 'pc', 'halted', 'clock_ps', 'elapsed', 'trace'}
+        """
+        if self._regs is None:
+            raise RuntimeError("尚未装载程序，请先调用 load()")
+        state = self.state
+        n = len(self.program)
+        pc = state.pc
+        steps = 0
+        start = time.perf_counter()
+        if debug:
+            trace = []
+            wait_ps = 0.0
+            while 0 <= pc < n and steps < max_steps and not state.halted:
+                instruction, *args = self.program[pc]
+                if instruction == ChronosInstruction.WAIT:
+                    wait_ps += state.time_registers[args[0]].picoseconds
+                elif instruction == ChronosInstruction.NOP:
+                    wait_ps += args[0] if args else 0.0
+                state.pc = pc + 1
+                trace.append(f"{pc:4d}: {self.execute(instruction, *args)}")
+                pc = state.pc
+                steps += 1
+        else:
+            trace = None
+            t, ph, fr, flags, wait = self._regs
+            t[:] = [tv.picoseconds for tv in state.time_registers]
+            ph[:] = state.phase_registers
+            fr[:] = state.freq_registers
+            flags[:] = [state.earlier, state.coincide]
+            wait[0] = 0.0
+            ops = self._ops
+            if not state.halted:
+                while 0 <= pc < n and steps < max_steps:
+                    pc = ops[pc](pc)
+                    steps += 1
+            state.time_registers = [TimeValue(ps) for ps in t]
+            state.phase_registers = list(ph)
+            state.freq_registers = list(fr)
+            state.earlier, state.coincide = flags
+            wait_ps = wait[0]
+            if pc < 0:
+                state.halted = True
+                pc = ~pc
+        state.pc = pc
+        return {'steps': steps, 'pc': pc, 'halted': state.halted,
+                'clock_ps': steps * gate_delay_ps + wait_ps,
+                'elapsed': time.perf_counter() - start, 'trace': trace}
+    
     # === 时间数据指令 ===
     
     def _exec_delay(self, reg: int, picoseconds: float):
@@ -288,9 +498,14 @@ class ChronosCPU:
         delay = self.state.time_registers[reg]
         return f"⏳ 等待: {delay}"
     
-    def _exec_nop(self, delay_ps: float):
+    def _exec_nop(self, delay_ps: float = 0.0):
         """空操作（延迟）"""
         return f"⏸️ NOP: 延迟{delay_ps}ps"
+    
+    def _exec_halt(self):
+        """停机"""
+        self.state.halted = True
+        return "🛑 停机"
 
 def demonstrate_chronos_cpu():
     """演示Chronos CPU"""
@@ -345,6 +560,28 @@ def demonstrate_chronos_cpu():
     print("   = 3.333ns × 0.3m/ns = 1米")
     print()
     
+    # 示例6：程序执行 - 时间条件分支构成循环
+    print("【示例6：程序执行 - 按时间分支的循环】")
+    I = ChronosInstruction
+    program = [
+        (I.DELAY, 0, 0),            # 0: T0 = 0（累加器）
+        (I.DELAY, 1, 250),          # 1: T1 = 250ps（步长）
+        (I.DELAY, 2, 1000),         # 2: T2 = 1ns（上限）
+        (I.ADD_DELAY, 0, 1, 0),     # 3: T0 += T1
+        (I.BRANCH_TIME, 0, 2, 3),   # 4: T0 < T2 则回到 3
+        (I.HALT,),                  # 5
+    ]
+    result = cpu.load(program).run(debug=True)
+    for line in result['trace']:
+        print(line)
+    program[2] = (I.DELAY, 2, 250 * 5_000_000)  # 上限放大：500万圈 ≈ 10^7 条指令
+    start = time.perf_counter()
+    result = cpu.load(program).run()
+    print(f"快速模式: {result['steps']:,} 条指令, {time.perf_counter() - start:.2f}s "
+          f"({result['steps'] / result['elapsed'] / 1e6:.1f}M条/秒), "
+          f"T0 = {cpu.state.time_registers[0]}, 模拟时钟 {result['clock_ps'] / 1e6:.1f}μs")
+    print()
+    
     # 指令集总结
     print("=" * 70)
     print("【指令集总结】")
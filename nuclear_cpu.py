@@ -11,12 +11,18 @@
 - 超长寿命 (数十年无需充电)
 """
 
-import random
 import math
+from typing import Optional
+
+import numpy as np
+
+from rng_service import RandomStream, default_service
 
 class NuclearCPU:
-    def __init__(self):
+    def __init__(self, rng: Optional[RandomStream] = None):
         self.instructions = self._define_instructions()
+        # 熵源：每个实例一条独立随机流（模拟衰变事件）
+        self.entropy_pool = rng if rng is not None else default_service().stream()
         # 核素寄存器
         self.isotopes = {
             'Pu238': {'half_life': 87.7, 'power': 0.56, 'activity': 1.0},  # 钚-238
@@ -93,7 +99,12 @@ class NuclearCPU:
         activity = self.isotopes[isotope]['activity']
         # 简化模拟：基于衰变概率生成随机比特
         # 实际中使用泊松分布，这里简化为均匀分布
-        return random.randint(0, 1)
+        return self.entropy_pool.randint(0, 1)
+    
+    def generate_random_bits(self, n):
+        """批量生成 n 个随机比特（uint8 数组，每元素0/1），与核素无关，直接取熵源"""
+        packed = self.entropy_pool.fill(np.empty(-(-n // 8), dtype=np.uint8), 'bits')
+        return np.unpackbits(packed)[:n]
     
     def rtg_power_output(self, isotope, initial_power, years):
         """放射性同位素热电发生器(RTG)功率输出"""
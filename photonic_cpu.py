@@ -13,6 +13,220 @@
 
 import math
 import cmath
+import heapq
+import time
+from array import array
+from itertools import count
+
+import numpy as np
+
+# 光子寄存器的结构化数组布局：每个元素是一个 (寄存器, 波长通道) 上的光场
+# polarization 为偏振角 (rad)：0 = H，π/2 = V
+PHOTON_DTYPE = np.dtype([
+    ('wavelength', np.float64),   # nm
+    ('phase', np.float64),        # rad, [0, 2π)
+    ('polarization', np.float64), # rad, [0, π)
+    ('intensity', np.float64),    # 归一化强度
+])
+
+class PhotonRegisterFile:
+    """
+    数组化光子寄存器组 - 寄存器 × WDM通道 的结构化数组
+
+    与 PhotonicCPU 的字典寄存器语义相同，但每个操作一次作用于
+    所选寄存器的全部波长通道：regs 可以是下标、切片或下标数组，
+    参数可以是标量，也可以是按通道（或按寄存器×通道）广播的数组。
+    """
+
+    def __init__(self, num_registers: int, num_channels: int, start_nm=1530.0, spacing_nm=0.8):
+        self.regs = np.zeros((num_registers, num_channels), dtype=PHOTON_DTYPE)
+        self.regs['wavelength'] = start_nm + spacing_nm * np.arange(num_channels)
+        self.regs['intensity'] = 1.0
+
+    @property
+    def shape(self):
+        return self.regs.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.regs.nbytes
+
+    def emit(self, regs, intensity=1.0, wavelength=None):
+        """发射光子：设置强度（以及可选的波长栅格）"""
+        self.regs['intensity'][regs] = intensity
+        if wavelength is not None:
+            self.regs['wavelength'][regs] = wavelength
+
+    def phase_modulate(self, regs, phase_shift):
+        """相位调制（原地，取模 2π）"""
+        phase = self.regs['phase']
+        phase[regs] = np.mod(phase[regs] + phase_shift, 2 * math.pi)
+
+    def mzi_gate(self, regs1, regs2):
+        """MZ干涉：逐通道 I = I1 + I2 + 2√(I1·I2)·cos(Δφ)，返回 (强度, 相位差) 数组"""
+        p1, p2 = self.regs[regs1], self.regs[regs2]
+        phase_diff = p1['phase'] - p2['phase']
+        intensity_out = (p1['intensity'] + p2['intensity'] +
+                         2 * np.sqrt(p1['intensity'] * p2['intensity']) * np.cos(phase_diff))
+        return intensity_out, phase_diff
+
+    def optical_and(self, regs1, regs2, threshold=0.5):
+        """光学与门：两路强度都超过阈值输出1.0"""
+        i1, i2 = self.regs['intensity'][regs1], self.regs['intensity'][regs2]
+        return ((i1 > threshold) & (i2 > threshold)).astype(np.float64)
+
+    def polarization_gate(self, regs, angle):
+        """偏振旋转：偏振角加 angle（取模 π），返回新的偏振角"""
+        pol = self.regs['polarization']
+        pol[regs] = np.mod(pol[regs] + angle, math.pi)
+        return pol[regs]
+
+    def polarization_labels(self, regs) -> np.ndarray:
+        """偏振角 → 'H' / 'V'（取更接近的那个）"""
+        pol = self.regs['polarization'][regs]
+        return np.where(np.abs(pol - math.pi / 2) < math.pi / 4, 'V', 'H')
+
+    def wdm_multiplex(self, regs):
+        """波分复用：所选寄存器的全部通道摊平成 (wavelength, data) 结构化数组"""
+        p = self.regs[regs]
+        channels = np.empty(p.size, dtype=[('wavelength', np.float64), ('data', np.float64)])
+        channels['wavelength'] = p['wavelength'].reshape(-1)
+        channels['data'] = p['intensity'].reshape(-1)
+        return channels
+
+class MZIMesh:
+    """
+    可编程 MZI 网格 (Reck 三角 / Clements 矩形) 的传输矩阵引擎
+
+    每个 MZI 作用在相邻模式 (i, i+1) 上，2×2 传输矩阵
+        T(θ, φ) = [[e^{iφ}cos θ, -sin θ], [e^{iφ}sin θ, cos θ]]
+    同一列的 MZI 互不重叠，构成层 L_k；整体 U = D · L_{K-1} ··· L_0，D 为输出相位屏。
+
+    缓存的部分积：在"游标"层 k 处保存 P = L_{k-1}···L_0 与 S = D·L_{K-1}···L_{k+1}，
+    于是 U = S·L_k·P。改动第 k 层的一个相移器时 P、S 不变，
+    U 只需秩2更新 U += S[:, i:i+2]·(T' − T)·P[i:i+2, :]，O(N²)。
+    游标移到相邻层只需各作用一层（层是幺正的，S 用 L† 回退），
+    按层顺序扫描相位（标定、坐标下降）时每次更新都是毫秒级。
+    """
+
+    def __init__(self, num_modes: int, topology='clements', theta=None, phi=None, rng=None):
+        self.num_modes = n = num_modes
+        self.topology = topology
+        if topology == 'clements':
+            layers = [np.arange(k % 2, n - 1, 2) for k in range(n)]
+        elif topology == 'reck':
+            layers = [np.array([i for i in range(c % 2, n - 1, 2) if i <= c and i + c <= 2 * n - 4])
+                      for c in range(2 * n - 3)]
+        else:
+            raise ValueError(f"未知拓扑: {topology}")
+        self.layers = [top.astype(np.intp) for top in layers if len(top)]
+        self.mzi_layer = np.concatenate([np.full(len(top), k) for k, top in enumerate(self.layers)])
+        self.mzi_mode = np.concatenate(self.layers)
+        self._offsets = np.cumsum([0] + [len(top) for top in self.layers])
+        rng = rng if rng is not None else np.random.default_rng()
+        m = len(self.mzi_mode)
+        self.theta = np.asarray(theta, dtype=float) if theta is not None else rng.uniform(0, math.pi / 2, m)
+        self.phi = np.asarray(phi, dtype=float) if phi is not None else rng.uniform(0, 2 * math.pi, m)
+        self.output_phase = np.zeros(n)
+        self.recompose()
+
+    @property
+    def num_mzis(self) -> int:
+        return len(self.mzi_mode)
+
+    @property
+    def depth(self) -> int:
+        return len(self.layers)
+
+    @staticmethod
+    def transfer_matrix(theta, phi) -> np.ndarray:
+        """单个 MZI 的 2×2 传输矩阵"""
+        e = cmath.exp(1j * phi)
+        return np.array([[e * math.cos(theta), -math.sin(theta)],
+                         [e * math.sin(theta), math.cos(theta)]])
+
+    def _blocks(self, k: int):
+        """第 k 层全部 MZI 的矩阵元 (a, b, c, d)，各为长度 m 的数组"""
+        sl = slice(self._offsets[k], self._offsets[k + 1])
+        e = np.exp(1j * self.phi[sl])
+        cos, sin = np.cos(self.theta[sl]), np.sin(self.theta[sl])
+        return e * cos, -sin, e * sin, cos
+
+    def _apply_left(self, k: int, M: np.ndarray, adjoint=False):
+        """M ← L_k·M（或 L_k†·M），只改动成对的行"""
+        top = self.layers[k]
+        a, b, c, d = self._blocks(k)
+        if adjoint:
+            a, b, c, d = a.conj(), c.conj(), b.conj(), d.conj()
+        r0, r1 = M[top], M[top + 1]
+        M[top] = a[:, None] * r0 + b[:, None] * r1
+        M[top + 1] = c[:, None] * r0 + d[:, None] * r1
+        return M
+
+    def _apply_right(self, k: int, M: np.ndarray, adjoint=False):
+        """M ← M·L_k（或 M·L_k†），只改动成对的列"""
+        top = self.layers[k]
+        a, b, c, d = self._blocks(k)
+        if adjoint:
+            a, b, c, d = a.conj(), c.conj(), b.conj(), d.conj()
+        c0, c1 = M[:, top], M[:, top + 1]
+        M[:, top] = c0 * a + c1 * c
+        M[:, top + 1] = c0 * b + c1 * d
+        return M
+
+    def recompose(self):
+        """从头合成 U，并把游标放在第 0 层"""
+        n = self.num_modes
+        S = np.diag(np.exp(1j * self.output_phase))
+        for k in range(self.depth - 1, 0, -1):
+            self._apply_right(k, S)
+        self._cursor = 0
+        self._prefix = np.eye(n, dtype=complex)
+        self._suffix = S
+        self.U = self._apply_right(0, S.copy())
+        return self.U
+
+    def _move_cursor(self, k: int):
+        """游标逐层移动到 k：P、S 各作用一层"""
+        while self._cursor < k:
+            c = self._cursor
+            self._apply_left(c, self._prefix)
+            self._apply_right(c + 1, self._suffix, adjoint=True)
+            self._cursor += 1
+        while self._cursor > k:
+            c = self._cursor
+            self._apply_left(c - 1, self._prefix, adjoint=True)
+            self._apply_right(c, self._suffix)
+            self._cursor -= 1
+
+    def set_phase(self, mzi: int, theta=None, phi=None):
+        """改动一个 MZI 的相移器，秩2增量更新 U"""
+        k, i = int(self.mzi_layer[mzi]), int(self.mzi_mode[mzi])
+        self._move_cursor(k)
+        old = self.transfer_matrix(self.theta[mzi], self.phi[mzi])
+        if theta is not None:
+            self.theta[mzi] = theta
+        if phi is not None:
+            self.phi[mzi] = phi
+        delta = self.transfer_matrix(self.theta[mzi], self.phi[mzi]) - old
+        self.U += self._suffix[:, i:i + 2] @ delta @ self._prefix[i:i + 2, :]
+        return self.U
+
+    def set_output_phase(self, mode: int, phase: float):
+        """改动输出相位屏的一路：U 与 S 的对应行乘同一相位因子"""
+        factor = cmath.exp(1j * (phase - self.output_phase[mode]))
+        self.output_phase[mode] = phase
+        self.U[mode] *= factor
+        self._suffix[mode] *= factor
+        return self.U
+
+    def propagate(self, fields: np.ndarray) -> np.ndarray:
+        """批量传播输入光场：(batch, N) 或 (N,) → 输出光场，一次矩阵乘"""
+        return np.asarray(fields) @ self.U.T
+
+    def detect(self, fields: np.ndarray) -> np.ndarray:
+        """传播后的输出强度 |E|²"""
+        return np.abs(self.propagate(fields)) ** 2
 
 class PhotonicCPU:
     def __init__(self):
@@ -147,6 +361,18 @@ class PhotonicCPU:
         result = 1.0 if (i1 > threshold and i2 > threshold) else 0.0
         return result
     
+    def create_register_file(self, num_registers, num_channels, start_nm=1530.0, spacing_nm=0.8):
+        """分配数组化寄存器组（密集WDM：数百波长 × 大量寄存器）"""
+        return PhotonRegisterFile(num_registers, num_channels, start_nm, spacing_nm)
+    
+    def create_mesh(self, num_modes, topology='clements', rng=None):
+        """构造可编程 MZI 网格 (N×N 幺正)"""
+        return MZIMesh(num_modes, topology, rng=rng)
+    
+    def create_event_simulator(self):
+        """构造离散事件仿真器（时延由 calculate_propagation_time 给出）"""
+        return PhotonicEventSimulator(self)
+    
     def calculate_propagation_time(self, distance_m, n=1.5):
         """计算光传播时间"""
         # n: 折射率 (光纤 ~1.5)
@@ -188,6 +414,215 @@ class PhotonicCPU:
                     info = self.instructions[instr]
                     print(f"  {instr:<15} - {info['desc']:<20} [{info['component']}]")
 
+# 离散事件仿真的元件类型
+WAVEGUIDE, SPLITTER, DELAY_LINE, FIBER_LOOP, LOOP_EXIT, DETECTOR, SOURCE = range(7)
+
+class PhotonicEventSimulator:
+    """
+    光子流水线离散事件仿真器
+
+    元件是图节点：光源、波导、分束器、延迟线、光纤环缓存、探测器。
+    每个节点的时延都由 PhotonicCPU.calculate_propagation_time(长度, 折射率) 得到。
+    脉冲事件 (时刻, 序号, 节点, 强度, 发射时刻) 放在 heapq 小根堆里按时间顺序处理，
+    序号保证同一时刻先进先出。
+    有状态的元件需要严格的时间顺序：
+    - 光纤环缓存：容量有限，满了就丢弃新脉冲；脉冲绕环 loops 圈后离开。
+    - 探测器：有死时间，死时间内到达的脉冲会丢失。
+    主循环只用列表下标和局部变量，每秒约数十万到百万个事件。
+    """
+
+    def __init__(self, cpu: 'PhotonicCPU' = None):
+        self.cpu = cpu if cpu is not None else PhotonicCPU()
+        self.names = []
+        self.kind = []
+        self.latency = []      # s
+        self.gain = []         # 强度透过率
+        self.threshold = []    # 探测器强度阈值
+        self.outputs = []      # 下游节点列表
+        self.param = []        # 分束比 / 绕环圈数 / 探测器死时间 / 光源周期
+        self.capacity = []     # 光纤环容量 / 光源剩余脉冲数
+        self.index = {}
+        self._events = []
+        self._seq = count()
+        self._sources = {}     # 光源节点 → (起始时刻, 脉冲总数)
+        self._state = None     # 跨 run 保留的运行状态，reset() 清空
+
+    def _add(self, name, kind, latency=0.0, gain=1.0, param=0.0, capacity=0, threshold=0.0):
+        self.index[name] = len(self.names)
+        self.names.append(name)
+        self.kind.append(kind)
+        self.latency.append(latency)
+        self.gain.append(gain)
+        self.threshold.append(threshold)
+        self.outputs.append([])
+        self.param.append(param)
+        self.capacity.append(capacity)
+        return self.index[name]
+
+    def _delay(self, length_m, n):
+        return self.cpu.calculate_propagation_time(length_m, n)
+
+    def add_waveguide(self, name, length_m, loss_db=0.0, n=1.5):
+        return self._add(name, WAVEGUIDE, self._delay(length_m, n), 10 ** (-loss_db / 10))
+
+    def add_splitter(self, name, ratio=0.5, length_m=1e-4, n=3.5):
+        """分束器：强度按 ratio / 1-ratio 分到两个下游（按 connect 的顺序）"""
+        return self._add(name, SPLITTER, self._delay(length_m, n), 1.0, ratio)
+
+    def add_delay_line(self, name, length_m, loss_db=0.0, n=1.5):
+        return self._add(name, DELAY_LINE, self._delay(length_m, n), 10 ** (-loss_db / 10))
+
+    def add_fiber_loop(self, name, length_m, loops=1, capacity=16, loss_db_per_loop=0.0, n=1.5):
+        """光纤环缓存：脉冲存 loops 圈，同时最多 capacity 个脉冲"""
+        node = self._add(name, FIBER_LOOP, loops * self._delay(length_m, n),
+                         10 ** (-loops * loss_db_per_loop / 10), loops, capacity)
+        exit_node = self._add(f'{name}.exit', LOOP_EXIT)
+        self.outputs[node].append(exit_node)
+        return node
+
+    def add_detector(self, name, dead_time=0.0, threshold=0.0):
+        """探测器（终点）：记录到达时延；param 为死时间，低于 threshold 的脉冲不计数"""
+        return self._add(name, DETECTOR, 0.0, 1.0, dead_time, threshold=threshold)
+
+    def add_source(self, name, period, pulses, start=0.0, intensity=1.0):
+        """周期脉冲光源：堆里始终只有下一个发射事件，长脉冲串不占内存"""
+        if pulses < 1:
+            raise ValueError(f"光源 {name} 至少发射1个脉冲，得到 {pulses}")
+        node = self._add(name, SOURCE, 0.0, intensity, period, pulses - 1)
+        self._sources[node] = (float(start), pulses)
+        self._events.append((float(start), next(self._seq), node, float(intensity), float(start)))
+        return node
+
+    def connect(self, src, dst):
+        src, dst = self.index[src], self.index[dst]
+        if self.kind[src] == FIBER_LOOP:
+            src = self.outputs[src][0]  # 从环的出口接出
+        self.outputs[src].append(dst)
+        return self
+
+    def inject(self, node, times, intensity=1.0):
+        """在节点注入一串脉冲（times 为发射时刻数组）"""
+        node = self.index[node]
+        seq = self._seq
+        self._events.extend((float(t), next(seq), node, float(intensity), float(t)) for t in times)
+
+    def _run_state(self):
+        """取运行状态；run 之后新加的节点在这里补上初值"""
+        state = self._state
+        if state is None:
+            state = self._state = {'capacity': [], 'occupancy': [], 'last_hit': [], 'first_hit': [],
+                                   'latencies': [], 'lost': [], 'dropped': 0, 'sim_time': 0.0}
+        for node in range(len(state['capacity']), len(self.kind)):
+            state['capacity'].append(self.capacity[node])
+            state['occupancy'].append(0)
+            state['last_hit'].append(-math.inf)
+            state['first_hit'].append(math.inf)
+            state['latencies'].append(array('d'))
+            state['lost'].append(0)
+        return state
+
+    def reset(self):
+        """清空运行状态和待处理事件，光源重新从第一个脉冲开始；inject 的脉冲需要重新注入"""
+        self._state = None
+        self._events = [(start, next(self._seq), node, float(self.gain[node]), start)
+                        for node, (start, _) in self._sources.items()]
+
+    def run(self, until=float('inf'), max_events=None):
+        """
+        按时间顺序处理事件，返回统计
+
+        返回 {'events', 'wall_time', 'events_per_sec', 'sim_time', 'dropped',
+              'detectors': {名字: {'count', 'lost', 'mean_latency', 'p99_latency', 'throughput'}}}
+        因 until 停止时 sim_time 为 until，越界的事件放回堆里留待下次 run。
+        光源剩余脉冲、环占用、探测器记录等状态跨 run 保留，可以分段续跑；
+        events 是本次处理的事件数，dropped 和 detectors 是累计值。重新开始要先 reset()。
+        """
+        heap = self._events
+        heapq.heapify(heap)
+        pop, push, seq = heapq.heappop, heapq.heappush, self._seq
+        kind, latency, gain, outputs, param = self.kind, self.latency, self.gain, self.outputs, self.param
+        threshold = self.threshold
+        state = self._run_state()
+        capacity = state['capacity']
+        sources = self._sources
+        occupancy = state['occupancy']
+        loop_of = {out[0]: node for node, out in enumerate(outputs) if kind[node] == FIBER_LOOP}
+        last_hit = state['last_hit']
+        latencies = state['latencies']
+        first_hit = state['first_hit']
+        lost = state['lost']
+        dropped = state['dropped']
+        events = 0
+        limit = max_events if max_events is not None else math.inf
+        t = state['sim_time']
+        start = time.perf_counter()
+        while heap and events < limit:
+            t, _, node, amp, birth = pop(heap)
+            if t > until:
+                push(heap, (t, next(seq), node, amp, birth))
+                t = until
+                break
+            events += 1
+            k = kind[node]
+            if k == WAVEGUIDE or k == DELAY_LINE:
+                arrival = t + latency[node]
+                amp *= gain[node]
+                for dst in outputs[node]:
+                    push(heap, (arrival, next(seq), dst, amp, birth))
+            elif k == SPLITTER:
+                arrival = t + latency[node]
+                out = outputs[node]
+                ratio = param[node]
+                push(heap, (arrival, next(seq), out[0], amp * ratio, birth))
+                if len(out) > 1:
+                    push(heap, (arrival, next(seq), out[1], amp * (1 - ratio), birth))
+            elif k == FIBER_LOOP:
+                if occupancy[node] >= capacity[node]:
+                    dropped += 1
+                    continue
+                occupancy[node] += 1
+                push(heap, (t + latency[node], next(seq), outputs[node][0], amp * gain[node], birth))
+            elif k == LOOP_EXIT:
+                occupancy[loop_of[node]] -= 1
+                for dst in outputs[node]:
+                    push(heap, (t, next(seq), dst, amp, birth))
+            elif k == SOURCE:
+                for dst in outputs[node]:
+                    push(heap, (t, next(seq), dst, amp, t))
+                if capacity[node] > 0:
+                    capacity[node] -= 1
+                    # 按序号算发射时刻，避免逐次累加周期的浮点漂移
+                    first, total = sources[node]
+                    t_next = first + (total - capacity[node] - 1) * param[node]
+                    push(heap, (t_next, next(seq), node, amp, t_next))
+            else:  # DETECTOR
+                if amp < threshold[node] or t - last_hit[node] < param[node]:
+                    lost[node] += 1
+                    continue
+                last_hit[node] = t
+                if first_hit[node] == math.inf:
+                    first_hit[node] = t
+                latencies[node].append(t - birth)
+        wall = time.perf_counter() - start
+        state['dropped'] = dropped
+        state['sim_time'] = t
+        
+        detectors = {}
+        for node, k in enumerate(kind):
+            if k != DETECTOR:
+                continue
+            lat = np.frombuffer(latencies[node], dtype=np.float64) if len(latencies[node]) else np.zeros(0)
+            span = last_hit[node] - first_hit[node]
+            detectors[self.names[node]] = {
+                'count': len(lat),
+                'lost': lost[node],
+                'mean_latency': float(lat.mean()) if len(lat) else None,
+                'p99_latency': float(np.percentile(lat, 99)) if len(lat) else None,
+                'throughput': (len(lat) - 1) / span if span > 0 else None,
+            }
+        return {'events': events, 'wall_time': wall, 'events_per_sec': events / wall if wall > 0 else None,
+                'sim_time': t, 'dropped': dropped, 'pending': len(heap), 'detectors': detectors}
+
 def demonstrate_photonic_computing():
     """演示光子计算"""
     cpu = PhotonicCPU()
@@ -264,6 +699,77 @@ def demonstrate_photonic_computing():
     print(f"  通道数: {num_channels}")
     print(f"  每通道速率: {data_rate_per_channel} Gbps")
     print(f"  总带宽: {total_bandwidth/1000:.1f} Tbps")
+    
+    # 7. 数组化寄存器：密集WDM链路一次处理
+    print("\n7. 数组化光子寄存器 (密集WDM):")
+    registers, channels = 2048, 400
+    bank = cpu.create_register_file(registers, channels, start_nm=1530.0, spacing_nm=0.1)
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    bank.emit(slice(None), rng.random((registers, channels)))
+    bank.phase_modulate(slice(0, registers, 2), rng.uniform(0, 2 * math.pi, channels))
+    intensity, _ = bank.mzi_gate(slice(0, registers, 2), slice(1, registers, 2))
+    logic = bank.optical_and(slice(0, registers, 2), slice(1, registers, 2))
+    bank.polarization_gate(slice(None), math.pi / 2)
+    link = bank.wdm_multiplex(slice(None))
+    elapsed = time.perf_counter() - start
+    print(f"  {registers}寄存器 × {channels}波长 = {bank.regs.size:,}个光场 "
+          f"({bank.nbytes / 2**20:.0f}MB)")
+    print(f"  发射+调制+MZI+与门+偏振+复用: {elapsed * 1000:.1f}ms")
+    print(f"  MZI平均输出强度: {intensity.mean():.3f}, 与门为1的比例: {logic.mean():.3f}, "
+          f"偏振: {bank.polarization_labels(0)[0]}, 复用通道数: {len(link):,}")
+    
+    # 8. 可编程 MZI 网格
+    print("\n8. 可编程MZI网格 (Clements, 256×256):")
+    mesh = cpu.create_mesh(256, 'clements', rng=rng)
+    start = time.perf_counter()
+    mesh.recompose()
+    compose_time = time.perf_counter() - start
+    print(f"  {mesh.num_mzis:,}个MZI, {mesh.depth}层, 完整合成: {compose_time * 1000:.1f}ms")
+    updates = [int(m) for m in np.sort(rng.choice(mesh.num_mzis, 200, replace=False))]
+    start = time.perf_counter()
+    for m in updates:
+        mesh.set_phase(m, theta=rng.uniform(0, math.pi / 2), phi=rng.uniform(0, 2 * math.pi))
+    update_time = (time.perf_counter() - start) / len(updates)
+    incremental = mesh.U.copy()
+    drift = np.abs(incremental - mesh.recompose()).max()
+    unitarity = np.abs(incremental @ incremental.conj().T - np.eye(256)).max()
+    print(f"  按层顺序改200个相移器: 平均 {update_time * 1000:.2f}ms/次, "
+          f"与重新合成的偏差 {drift:.1e}, 幺正误差 {unitarity:.1e}")
+    fields = rng.normal(size=(4096, 256)) + 1j * rng.normal(size=(4096, 256))
+    start = time.perf_counter()
+    out = mesh.detect(fields)
+    elapsed = time.perf_counter() - start
+    energy = np.abs(fields) ** 2
+    print(f"  批量传播4096个输入矢量: {elapsed * 1000:.1f}ms, "
+          f"能量守恒误差 {abs(out.sum() - energy.sum()) / energy.sum():.1e}")
+    reck = cpu.create_mesh(8, 'reck', rng=rng)
+    print(f"  Reck三角网格 8×8: {reck.num_mzis}个MZI, {reck.depth}层")
+    
+    # 9. 离散事件仿真：光纤环缓存流水线
+    print("\n9. 离散事件仿真 (波导 → 分束 → 延迟线 / 光纤环缓存 → 探测器):")
+    sim = cpu.create_event_simulator()
+    sim.add_waveguide('in', 0.01)
+    sim.add_splitter('split', 0.5)
+    sim.add_delay_line('delay', 2.0, loss_db=0.1)
+    sim.add_fiber_loop('loop', 0.2, loops=5, capacity=4, loss_db_per_loop=0.05)
+    sim.add_waveguide('out_a', 0.005)
+    sim.add_waveguide('out_b', 0.005)
+    sim.add_detector('det_a', dead_time=50e-12)
+    sim.add_detector('det_b', dead_time=50e-12)
+    for a, b in [('in', 'split'), ('split', 'delay'), ('split', 'loop'), ('delay', 'out_a'),
+                 ('loop', 'out_b'), ('out_a', 'det_a'), ('out_b', 'det_b')]:
+        sim.connect(a, b)
+    pulses = 200_000
+    sim.add_source('laser', period=1e-9, pulses=pulses)  # 1 GHz 脉冲串
+    sim.connect('laser', 'in')
+    stats = sim.run()
+    print(f"  {pulses:,}个脉冲 → {stats['events']:,}个事件, {stats['wall_time']:.2f}s "
+          f"({stats['events_per_sec'] / 1e6:.2f}M事件/秒), 光纤环丢弃 {stats['dropped']:,}")
+    for name, det in stats['detectors'].items():
+        print(f"  {name}: 收到 {det['count']:,}, 死时间丢失 {det['lost']:,}, "
+              f"平均时延 {det['mean_latency'] * 1e9:.2f}ns, p99 {det['p99_latency'] * 1e9:.2f}ns, "
+              f"吞吐 {det['throughput'] / 1e9:.3f} G脉冲/秒")
 
 def analyze_photonic_cpu():
     """分析光子CPU特性"""
@@ -10,16 +10,21 @@
 - 蒙特卡洛计算范式
 """
 
-import random
 import math
+from typing import Optional
+
+import numpy as np
+
+from rng_service import RandomStream, RNGService, default_service
 
 class ProbabilisticCPU:
-    def __init__(self):
+    def __init__(self, rng: Optional[RandomStream] = None):
         self.instructions = self._define_instructions()
         self.memory = [0] * 256
         self.registers = {'A': 0, 'B': 0, 'C': 0, 'D': 0}
         self.pc = 0
-        self.entropy_pool = random.Random()
+        # 每个实例一条独立随机流（由根种子派生，可复现）
+        self.entropy_pool = rng if rng is not None else default_service().stream()
         
     def _define_instructions(self):
         """定义概率指令集"""
@@ -83,7 +88,7 @@ class ProbabilisticCPU:
         success_prob = instr['prob']
         
         # 概率性执行
-        if random.random() > success_prob:
+        if self.entropy_pool.random() > success_prob:
             return False, f"指令失败 (概率={success_prob})"
         
         # 执行具体指令
@@ -96,20 +101,20 @@ class ProbabilisticCPU:
         elif instruction == 'PDIV':
             self.registers['A'] = args[0] / args[1] if args[1] != 0 else 0
         elif instruction == 'RAND':
-            self.registers['A'] = random.random()
+            self.registers['A'] = self.entropy_pool.random()
         elif instruction == 'COIN':
-            self.registers['A'] = 1 if random.random() < 0.5 else 0
+            self.registers['A'] = 1 if self.entropy_pool.random() < 0.5 else 0
         elif instruction == 'DICE':
-            self.registers['A'] = random.randint(1, 6)
+            self.registers['A'] = self.entropy_pool.randint(1, 6)
         elif instruction == 'NOISE':
-            self.registers['A'] = args[0] + random.gauss(0, 0.1)
+            self.registers['A'] = args[0] + self.entropy_pool.gauss(0, 0.1)
         elif instruction == 'SUPERPOSE':
             # 创建叠加态 (多个可能值)
             self.registers['A'] = [args[0], args[1]]
         elif instruction == 'COLLAPSE':
             # 坍缩到一个值
             if isinstance(self.registers['A'], list):
-                self.registers['A'] = random.choice(self.registers['A'])
+                self.registers['A'] = self.entropy_pool.choice(self.registers['A'])
         
         return True, f"成功执行 {instruction}"
     
@@ -117,7 +122,7 @@ class ProbabilisticCPU:
         """蒙特卡洛估算π"""
         inside = 0
         for _ in range(samples):
-            x, y = random.random(), random.random()
+            x, y = self.entropy_pool.random(), self.entropy_pool.random()
             if x*x + y*y <= 1:
                 inside += 1
         return 4 * inside / samples
@@ -129,7 +134,7 @@ class ProbabilisticCPU:
         
         for _ in range(100):
             # 生成邻居
-            neighbor = current + random.gauss(0, 1)
+            neighbor = current + self.entropy_pool.gauss(0, 1)
             neighbor_cost = func(neighbor)
             
             # 接受概率
@@ -138,7 +143,7 @@ class ProbabilisticCPU:
                 current_cost = neighbor_cost
             else:
                 prob = math.exp(-(neighbor_cost - current_cost) / temp)
-                if random.random() < prob:
+                if self.entropy_pool.random() < prob:
                     current = neighbor
                     current_cost = neighbor_cost
             
@@ -146,6 +151,415 @@ class ProbabilisticCPU:
         
         return current, current_cost
     
+    def _uniform_block(self, n, dim, method, rng):
+        """生成一块 [0,1)^dim 均匀样本，可选方差缩减"""
+        if method == 'plain':
+            return rng.random((n, dim))
+        if method == 'antithetic':
+            # 对偶变量：u 与 1-u 成对出现，负相关抵消方差
+            u = rng.random((n // 2, dim))
+            return np.concatenate([u, 1.0 - u])
+        if method == 'stratified':
+            # 拉丁超立方：每一维的 n 个分层各取一个样本
+            strata = np.stack([rng.permutation(n) for _ in range(dim)], axis=1)
+            return (strata + rng.random((n, dim))) / n
+        if method == 'sobol':
+            # 加扰Sobol准随机序列，每块独立加扰以便估计误差
+            from scipy.stats import qmc
+            return qmc.Sobol(d=dim, scramble=True, seed=rng).random(n)
+        raise ValueError(f"未知方法: {method}")
+
+    def monte_carlo_integrate(self, func, dim, samples, block=1 << 20, method='plain', rng=None):
+        """
+        批量蒙特卡洛积分：估计 E[func(u)]，u ~ U[0,1)^dim
+
+        func 向量化：输入 (n, dim) 数组，返回 (n,) 数组。
+        样本按块生成和消耗，内存只与 block 有关，可跑 10^10 样本。
+        method: 'plain' | 'antithetic' | 'stratified' | 'sobol'
+        返回 (估计值, 标准误差)，误差由各独立块之间的离散度估计。
+        """
+        rng = rng if rng is not None else self.entropy_pool.generator
+        block = max(2, min(block, samples // 8))  # 至少8块，才能估计误差
+        if method == 'sobol':
+            block = 1 << (block.bit_length() - 1)  # Sobol 块大小取2的幂
+        block -= block % 2
+        
+        total, done = 0.0, 0
+        block_means = []
+        while done < samples:
+            # 末块也取整块（样本数向上取整），各块等大，误差估计无偏
+            values = np.asarray(func(self._uniform_block(block, dim, method, rng)), dtype=np.float64)
+            total += values.sum()
+            done += len(values)
+            block_means.append(values.mean())
+        
+        block_means = np.asarray(block_means)
+        stderr = block_means.std(ddof=1) / math.sqrt(len(block_means)) if len(block_means) > 1 else float('nan')
+        return total / done, stderr
+
+    def monte_carlo_pi_batched(self, samples=10**7, block=1 << 20, method='plain', rng=None):
+        """向量化蒙特卡洛估算π，返回 (估计值, 标准误差)"""
+        inside = lambda u: (u * u).sum(axis=1) <= 1.0
+        estimate, stderr = self.monte_carlo_integrate(inside, 2, samples, block, method, rng)
+        return 4 * estimate, 4 * stderr
+
+    def parallel_monte_carlo_pi(self, samples=10**8, workers=4, seed=None, method='plain',
+                                block=1 << 20):
+        """
+        多进程蒙特卡洛估算π
+
+        每个工作进程一条独立子流：给定 seed 时从 RNGService(seed) 派生，
+        否则从本实例的随机流派生（因而由 set_root_seed 的根种子决定）。
+        结果与调度顺序无关、完全可复现。
+        """
+        from multiprocessing import Pool
+
+        if seed is None:
+            worker_seeds = self.entropy_pool.seed_seq.spawn(workers)
+        else:
+            worker_seeds = RNGService(seed).worker_seeds(workers)
+        per_worker = -(-samples // workers)
+        tasks = [(seed_seq, per_worker, method, block) for seed_seq in worker_seeds]
+        with Pool(workers) as pool:
+            results = pool.map(_pi_worker, tasks)
+        estimates = np.array([r[0] for r in results])
+        stderrs = np.array([r[1] for r in results])
+        return estimates.mean(), math.sqrt((stderrs ** 2).sum()) / workers
+
+    def parallel_tempering(self, func, initial, chains=64, steps=1000, t_min=0.01, t_max=100.0,
+                           cooling=1.0, step_size=1.0, swap_every=10, rng=None):
+        """
+        多链并行退火 / 并行回火 (Parallel Tempering)
+
+        chains 条马尔可夫链各处在几何分布的温度上，一次向量化调用 func
+        同时评估所有链的邻居；每 swap_every 步在相邻温度间交换状态。
+        cooling < 1 时整个温度梯子同时降温（多链退火）。
+        func 向量化：输入 (chains, dim) 数组，返回 (chains,) 代价。
+        """
+        rng = rng if rng is not None else self.entropy_pool.generator
+        scalar = np.ndim(initial) == 0
+        start = np.atleast_1d(np.asarray(initial, dtype=np.float64))
+        x = np.tile(start, (chains, 1))
+        cost = np.asarray(func(x), dtype=np.float64).reshape(chains)
+        temps = np.geomspace(t_min, t_max, chains)
+        best = int(np.argmin(cost))
+        best_x, best_cost = x[best].copy(), cost[best]
+        
+        for step in range(steps):
+            # Metropolis：所有链同时提议与接受
+            proposal = x + rng.normal(0.0, step_size, x.shape)
+            proposal_cost = np.asarray(func(proposal), dtype=np.float64).reshape(chains)
+            delta = proposal_cost - cost
+            accept = rng.random(chains) < np.exp(-np.maximum(delta, 0.0) / temps)
+            x[accept] = proposal[accept]
+            cost[accept] = proposal_cost[accept]
+            
+            i = int(np.argmin(cost))
+            if cost[i] < best_cost:
+                best_x, best_cost = x[i].copy(), cost[i]
+            
+            # 副本交换：奇偶相邻温度对交替尝试
+            if swap_every and step % swap_every == 0 and chains > 1:
+                lo = np.arange((step // swap_every) % 2, chains - 1, 2)
+                hi = lo + 1
+                log_ratio = (cost[lo] - cost[hi]) * (1.0 / temps[lo] - 1.0 / temps[hi])
+                swap = np.log(rng.random(len(lo))) < log_ratio
+                a, b = lo[swap], hi[swap]
+                x[a], x[b] = x[b].copy(), x[a].copy()
+                cost[a], cost[b] = cost[b], cost[a].copy()
+            
+            temps *= cooling
+        
+        return (best_x[0] if scalar else best_x), best_cost
+
+    def _check_program(self, program, register='A'):
+        """
+        执行前一次性检查程序（run_program / propagate_program 共用），不合法时抛 ValueError：
+        操作码必须在指令集里，LOAD 的目的操作数和字符串操作数必须是寄存器名，
+        跳转目标必须是 0~len(program) 的整数（len(program) 表示跳到末尾停机）。
+        """
+        if register not in self.registers:
+            raise ValueError(f"未知寄存器: {register}，可选: {list(self.registers)}")
+        for i, instruction in enumerate(program):
+            op, *args = instruction
+            if op not in self.instructions:
+                raise ValueError(f"第{i}条指令: 未知操作码 {op!r}")
+            operands = args
+            if op == 'LOAD':
+                if len(args) != 2 or args[0] not in self.registers:
+                    raise ValueError(f"第{i}条指令: LOAD 需要 (目的寄存器, 源)，得到 {instruction}")
+                operands = args[1:]
+            elif op == 'STORE':
+                operands = args[1:]
+            elif op in ('PJMP', 'QJMP'):
+                if not args:
+                    raise ValueError(f"第{i}条指令: {op} 缺少跳转目标")
+                target = args[0]
+                if (not isinstance(target, (int, np.integer)) or isinstance(target, bool)
+                        or not 0 <= target <= len(program)):
+                    raise ValueError(f"第{i}条指令: 跳转目标须为 0~{len(program)} 的整数，得到 {target!r}")
+                operands = args[1:]
+            for arg in operands:
+                if isinstance(arg, str) and arg not in self.registers:
+                    raise ValueError(f"第{i}条指令: 未知寄存器 {arg!r}")
+
+    def run_program(self, program, trials=10**6, register='A', max_cycles=10_000, rng=None):
+        """
+        批量执行概率程序：N次试验按通道(lane)锁步运行
+
+        program 为指令元组列表，结果统一写入 A（同 execute）：
+          ('LOAD', dst, src)          dst = src
+          ('STORE', addr, src)        memory[addr] = src
+          ('PADD'/'PSUB'/'PMUL'/'PDIV', x, y)
+          ('PAND'/'POR', x, y), ('PNOT', x)
+          ('RAND',), ('COIN',), ('DICE',), ('NOISE', x)
+          ('SUPERPOSE', x, y), ('COLLAPSE',)
+          ('PJMP'/'QJMP', target[, cond])  成功且 cond≠0 时跳转
+          ('HALT',)
+        操作数可以是寄存器名或常数。每条指令按 _define_instructions 的成功率
+        一次抽取整组通道的成功掩码，失败则跳过（同 execute）。
+        分支发散后，按 PC 把通道分组，各组分别向量化执行。
+        执行前先检查操作码、寄存器名和跳转目标，不合法时抛 ValueError。
+        其他指令（SAMPLE、ANNEAL等）只消耗周期与成功率。
+        
+        返回统计字典：已停机试验中指定寄存器最终值的直方图（p 为占全部试验的比例，
+        含Wilson 95%置信区间）、停机条件下的均值（与 propagate_program 口径一致）、
+        周期数均值与置信区间、每次试验的失败指令数、停机比例，
+        以及 STORE 写过的内存单元（地址 → 每次试验的值）。
+        """
+        self._check_program(program, register)
+        rng = rng if rng is not None else self.entropy_pool.generator
+        regs = {name: np.zeros(trials) for name in self.registers}
+        memory = {}
+        superposed = np.zeros((2, trials))
+        pc = np.zeros(trials, dtype=np.int64)
+        cycles = np.zeros(trials, dtype=np.int64)
+        failures = np.zeros(trials, dtype=np.int64)
+        running = np.ones(trials, dtype=bool)
+        
+        def value(arg, lanes):
+            if isinstance(arg, str) and arg in regs:
+                return regs[arg][lanes]
+            return np.full(len(lanes), float(arg))
+        
+        while True:
+            active = np.flatnonzero(running)
+            if len(active) == 0:
+                break
+            order = np.argsort(pc[active], kind='stable')
+            active = active[order]
+            pcs, starts = np.unique(pc[active], return_index=True)
+            for at, lanes in zip(pcs, np.split(active, starts[1:])):
+                if at >= len(program) or program[at][0] == 'HALT':
+                    running[lanes] = False
+                    continue
+                op, *args = program[at]
+                cycles[lanes] += 1
+                ok = rng.random(len(lanes)) < self.instructions[op]['prob']
+                failures[lanes[~ok]] += 1
+                hit = lanes[ok]
+                next_pc = np.full(len(lanes), at + 1)
+                
+                if op == 'LOAD':
+                    regs[args[0]][hit] = value(args[1], hit)
+                elif op == 'STORE':
+                    memory.setdefault(args[0], np.zeros(trials))[hit] = value(args[1], hit)
+                elif op in ('PADD', 'PSUB', 'PMUL', 'PDIV', 'PAND', 'POR'):
+                    x, y = value(args[0], hit), value(args[1], hit)
+                    if op == 'PADD':
+                        regs['A'][hit] = x + y
+                    elif op == 'PSUB':
+                        regs['A'][hit] = x - y
+                    elif op == 'PMUL':
+                        regs['A'][hit] = x * y
+                    elif op == 'PDIV':
+                        regs['A'][hit] = np.divide(x, y, out=np.zeros_like(x), where=y != 0)
+                    elif op == 'PAND':
+                        regs['A'][hit] = (x != 0) & (y != 0)
+                    else:
+                        regs['A'][hit] = (x != 0) | (y != 0)
+                elif op == 'PNOT':
+                    regs['A'][hit] = value(args[0], hit) == 0
+                elif op == 'RAND':
+                    regs['A'][hit] = rng.random(len(hit))
+                elif op == 'COIN':
+                    regs['A'][hit] = rng.random(len(hit)) < 0.5
+                elif op == 'DICE':
+                    regs['A'][hit] = rng.integers(1, 7, len(hit))
+                elif op == 'NOISE':
+                    regs['A'][hit] = value(args[0], hit) + rng.normal(0, 0.1, len(hit))
+                elif op == 'SUPERPOSE':
+                    superposed[0, hit] = value(args[0], hit)
+                    superposed[1, hit] = value(args[1], hit)
+                elif op == 'COLLAPSE':
+                    regs['A'][hit] = superposed[rng.integers(0, 2, len(hit)), hit]
+                elif op in ('PJMP', 'QJMP'):
+                    jump = ok.copy()
+                    if len(args) > 1:
+                        jump[ok] = value(args[1], hit) != 0
+                    next_pc[jump] = args[0]
+                
+                pc[lanes] = next_pc
+            running &= cycles < max_cycles
+        
+        # 停在 HALT 或程序末尾的通道才算停机（含恰好在第 max_cycles 个周期停下的）
+        halt_pcs = [i for i, instruction in enumerate(program) if instruction[0] == 'HALT']
+        halted = (pc >= len(program)) | np.isin(pc, halt_pcs)
+        final = regs[register][halted]
+        outcomes = {}
+        values, counts = np.unique(final, return_counts=True)
+        if len(values) <= 64:  # 连续值（RAND/NOISE）不做直方图
+            for v, k in zip(values, counts):
+                outcomes[float(v)] = {'count': int(k), 'p': k / trials,
+                                      'ci95': _wilson_interval(int(k), trials)}
+        half_width = 1.96 * cycles.std(ddof=1) / math.sqrt(trials) if trials > 1 else 0.0
+        return {
+            'trials': trials,
+            'outcomes': outcomes,
+            'mean': float(final.mean()) if len(final) else 0.0,
+            'cycles': {'mean': float(cycles.mean()),
+                       'ci95': (cycles.mean() - half_width, cycles.mean() + half_width)},
+            'failures': np.bincount(failures),
+            'halted': float(halted.mean()),
+            'memory': memory
+        }
+
+    def _successors(self, state, instruction):
+        """
+        一个确定机器状态执行一条指令后的所有后继：[(概率, 新状态), ...]
+
+        状态 = (pc, 寄存器元组, 内存元组, 叠加态对)，语义同 run_program。
+        连续分布指令（RAND、NOISE）无法精确枚举，返回 None。
+        """
+        pc, regs, memory, superposed = state
+        op, *args = instruction
+        names = list(self.registers)
+        
+        def value(arg):
+            if isinstance(arg, str) and arg in self.registers:
+                return regs[names.index(arg)]
+            return float(arg)
+        
+        def with_reg(name, v):
+            updated = list(regs)
+            updated[names.index(name)] = float(v)
+            return tuple(updated)
+        
+        if op in ('RAND', 'NOISE'):
+            return None
+        
+        q = self.instructions[op]['prob']
+        successors = []
+        if q < 1.0:
+            successors.append((1.0 - q, (pc + 1, regs, memory, superposed)))
+        
+        nxt = pc + 1
+        if op == 'LOAD':
+            done = [(1.0, (nxt, with_reg(args[0], value(args[1])), memory, superposed))]
+        elif op == 'STORE':
+            cells = dict(memory)
+            cells[args[0]] = value(args[1])
+            done = [(1.0, (nxt, regs, tuple(sorted(cells.items())), superposed))]
+        elif op in ('PADD', 'PSUB', 'PMUL', 'PDIV', 'PAND', 'POR'):
+            x, y = value(args[0]), value(args[1])
+            result = {
+                'PADD': lambda: x + y,
+                'PSUB': lambda: x - y,
+                'PMUL': lambda: x * y,
+                'PDIV': lambda: x / y if y != 0 else 0.0,
+                'PAND': lambda: float(x != 0 and y != 0),
+                'POR': lambda: float(x != 0 or y != 0),
+            }[op]()
+            done = [(1.0, (nxt, with_reg('A', result), memory, superposed))]
+        elif op == 'PNOT':
+            done = [(1.0, (nxt, with_reg('A', value(args[0]) == 0), memory, superposed))]
+        elif op == 'COIN':
+            done = [(0.5, (nxt, with_reg('A', v), memory, superposed)) for v in (0, 1)]
+        elif op == 'DICE':
+            done = [(1 / 6, (nxt, with_reg('A', v), memory, superposed)) for v in range(1, 7)]
+        elif op == 'SUPERPOSE':
+            done = [(1.0, (nxt, regs, memory, (value(args[0]), value(args[1]))))]
+        elif op == 'COLLAPSE':
+            done = [(0.5, (nxt, with_reg('A', v), memory, superposed)) for v in superposed]
+        elif op in ('PJMP', 'QJMP'):
+            jump = len(args) < 2 or value(args[1]) != 0
+            done = [(1.0, (args[0] if jump else nxt, regs, memory, superposed))]
+        else:
+            done = [(1.0, (nxt, regs, memory, superposed))]
+        
+        successors.extend((q * p, state) for p, state in done)
+        return successors
+
+    def propagate_program(self, program, register='A', max_cycles=10_000, state_budget=100_000,
+                          tol=1e-12, trials=10**6):
+        """
+        精确概率传播：在机器状态上推进概率分布，而不是采样
+
+        每个周期把所有未停机状态展开为后继，相同状态合并概率，
+        开销只与不同状态数成正比。给出寄存器最终值的精确分布和期望周期数。
+        状态数超过 state_budget、或遇到连续分布指令时，回退到 run_program 采样。
+        仍在运行的概率质量低于 tol（或超过 max_cycles）时停止，剩余质量记为 unfinished。
+        mean 为停机条件下的期望，与 run_program 口径一致。
+        """
+        self._check_program(program, register)
+        start = (0, tuple(0.0 for _ in self.registers), (), (0.0, 0.0))
+        frontier = {start: 1.0}
+        reg_index = list(self.registers).index(register)
+        outcomes = {}
+        expected_cycles = 0.0
+        peak_states = 1
+        
+        def drain(frontier):
+            """把已停机状态的概率计入 outcomes，返回仍在运行的状态"""
+            running = {}
+            for state, p in frontier.items():
+                pc = state[0]
+                if pc >= len(program) or program[pc][0] == 'HALT':
+                    v = state[1][reg_index]
+                    outcomes[v] = outcomes.get(v, 0.0) + p
+                else:
+                    running[state] = p
+            return running
+        
+        for _ in range(max_cycles):
+            running = drain(frontier)
+            mass = sum(running.values())
+            if mass <= tol:
+                frontier = running
+                break
+            expected_cycles += mass
+            
+            frontier = {}
+            for state, p in running.items():
+                successors = self._successors(state, program[state[0]])
+                if successors is None:
+                    return self._sampling_fallback(program, trials, register, max_cycles, '连续分布指令')
+                for q, nxt in successors:
+                    frontier[nxt] = frontier.get(nxt, 0.0) + p * q
+            peak_states = max(peak_states, len(frontier))
+            if len(frontier) > state_budget:
+                return self._sampling_fallback(program, trials, register, max_cycles, '状态数超出预算')
+        else:
+            frontier = drain(frontier)  # 用完 max_cycles 时，最后一步刚停机的状态
+        
+        unfinished = sum(frontier.values())
+        return {
+            'method': 'exact',
+            'outcomes': {float(v): {'p': p} for v, p in sorted(outcomes.items())},
+            'mean': sum(v * p for v, p in outcomes.items()) / max(1.0 - unfinished, tol),
+            'cycles': {'mean': expected_cycles},
+            'halted': 1.0 - unfinished,
+            'unfinished': unfinished,
+            'states': peak_states
+        }
+
+    def _sampling_fallback(self, program, trials, register, max_cycles, reason):
+        """精确传播不可行时改用批量采样"""
+        result = self.run_program(program, trials, register, max_cycles)
+        result['method'] = 'sampling'
+        result['reason'] = reason
+        return result
+
     def display(self):
         """展示概率CPU设计"""
         print("=" * 80)
@@ -173,6 +587,20 @@ class ProbabilisticCPU:
                     info = self.instructions[instr]
                     print(f"  {instr:<12} - {info['desc']:<30} (成功率: {info['prob']*100:.0f}%)")
 
+def _wilson_interval(k, n, z=1.96):
+    """二项比例的 Wilson 置信区间"""
+    p = k / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center - half, center + half
+
+def _pi_worker(task):
+    """parallel_monte_carlo_pi 的工作进程入口"""
+    seed_seq, samples, method, block = task
+    cpu = ProbabilisticCPU(rng=RandomStream(seed_seq))
+    return cpu.monte_carlo_pi_batched(samples, block, method)
+
 def demonstrate_probabilistic_computing():
     """演示概率计算"""
     cpu = ProbabilisticCPU()
@@ -227,6 +655,47 @@ def demonstrate_probabilistic_computing():
     func = lambda x: x**2
     result, cost = cpu.simulated_annealing(func, initial=10)
     print(f"  初始值: 10, 最优解: {result:.4f}, 最小值: {cost:.4f}")
+    
+    # 6. 批量蒙特卡洛 + 方差缩减
+    print("\n6. 批量蒙特卡洛估算π (10^7样本):")
+    for method in ['plain', 'antithetic', 'stratified', 'sobol']:
+        pi_estimate, stderr = cpu.monte_carlo_pi_batched(10**7, method=method)
+        print(f"  {method:<11} 估算值: {pi_estimate:.6f}, 标准误差: {stderr:.2e}")
+    
+    # 7. 多链并行回火
+    print("\n7. 并行回火 (64条链, 最小化 Rastrigin 函数):")
+    rastrigin = lambda x: (x**2 + 10 * (1 - np.cos(2 * np.pi * x))).sum(axis=1)
+    result, cost = cpu.parallel_tempering(rastrigin, initial=[4.5, -3.5], chains=64, steps=500)
+    print(f"  初始值: [4.5, -3.5], 最优解: {np.round(result, 4)}, 最小值: {cost:.4f}")
+    
+    # 8. 批量程序执行：100万次试验锁步运行
+    print("\n8. 概率程序可靠性 (10^6次试验):")
+    program = [
+        ('PADD', 2, 3),            # 0: A = 5 (95%成功)
+        ('LOAD', 'B', 'A'),        # 1: B = A
+        ('PMUL', 'B', 4),          # 2: A = B × 4 (90%成功)
+        ('QJMP', 5),               # 3: 50%跳过修正
+        ('PSUB', 'A', 1),          # 4: A = A - 1 (95%成功)
+        ('HALT',),
+    ]
+    result = cpu.run_program(program, trials=10**6)
+    for outcome, stats in sorted(result['outcomes'].items(), key=lambda kv: -kv[1]['count']):
+        lo, hi = stats['ci95']
+        print(f"  A = {outcome:g}: {stats['p']*100:6.2f}%  (95% CI {lo*100:.2f}%–{hi*100:.2f}%)")
+    lo, hi = result['cycles']['ci95']
+    print(f"  平均周期: {result['cycles']['mean']:.3f} (95% CI {lo:.3f}–{hi:.3f})")
+    
+    exact = cpu.propagate_program(program)
+    print(f"  精确传播 ({exact['states']}个不同状态):")
+    for outcome, stats in sorted(exact['outcomes'].items(), key=lambda kv: -kv[1]['p']):
+        print(f"  A = {outcome:g}: {stats['p']*100:8.4f}%")
+    print(f"  期望周期: {exact['cycles']['mean']:.4f}")
+    
+    # 9. 可复现的并行蒙特卡洛
+    print("\n9. 并行蒙特卡洛 (4进程, 根种子=42, 运行两次):")
+    for _ in range(2):
+        pi_estimate, stderr = cpu.parallel_monte_carlo_pi(4 * 10**6, workers=4, seed=42)
+        print(f"  估算值: {pi_estimate:.10f}, 标准误差: {stderr:.2e}")
 
 def analyze_probabilistic_cpu():
     """分析概率CPU特性"""
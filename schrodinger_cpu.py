@@ -13,11 +13,495 @@
 
 import numpy as np
 import cmath
+import hashlib
 import math
+from collections import OrderedDict
+
+# 常用单比特门（预先构造，避免每次调用重新分配）
+GATE_MATRICES = {
+    'H': np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2),
+    'X': np.array([[0, 1], [1, 0]], dtype=complex),
+    'Y': np.array([[0, -1j], [1j, 0]], dtype=complex),
+    'Z': np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+# 带参数的单比特门
+PARAM_GATES = {
+    'PHASE': lambda phi: np.array([[1, 0], [0, cmath.exp(1j * phi)]], dtype=complex),
+    'RX': lambda theta: np.array([[math.cos(theta / 2), -1j * math.sin(theta / 2)],
+                                  [-1j * math.sin(theta / 2), math.cos(theta / 2)]], dtype=complex),
+    'RY': lambda theta: np.array([[math.cos(theta / 2), -math.sin(theta / 2)],
+                                  [math.sin(theta / 2), math.cos(theta / 2)]], dtype=complex),
+    'RZ': lambda theta: np.diag([cmath.exp(-0.5j * theta), cmath.exp(0.5j * theta)]),
+}
+
+# 常用双比特门，按 (out_a, out_b, in_a, in_b) 排成 2×2×2×2
+CNOT_MATRIX = np.eye(4, dtype=complex)[[0, 1, 3, 2]].reshape(2, 2, 2, 2)
+SWAP_MATRIX = np.eye(4, dtype=complex)[[0, 2, 1, 3]].reshape(2, 2, 2, 2)
+CZ_MATRIX = np.diag([1, 1, 1, -1]).astype(complex).reshape(2, 2, 2, 2)
+
+# 单比特噪声信道的 Kraus 算符 {K_k}，ρ → Σ K_k ρ K_k†
+NOISE_CHANNELS = {
+    'depolarizing': lambda p: [math.sqrt(1 - p) * np.eye(2, dtype=complex)] +
+                              [math.sqrt(p / 3) * GATE_MATRICES[P] for P in ('X', 'Y', 'Z')],
+    'amplitude_damping': lambda gamma: [np.array([[1, 0], [0, math.sqrt(1 - gamma)]], dtype=complex),
+                                        np.array([[0, math.sqrt(gamma)], [0, 0]], dtype=complex)],
+    'dephasing': lambda p: [math.sqrt(1 - p) * np.eye(2, dtype=complex),
+                            math.sqrt(p) * GATE_MATRICES['Z']],
+}
+
+class StateVector:
+    """
+    n量子比特态矢量 - 长度 2^n 的复数数组
+
+    第 q 个量子比特对应 reshape 后的第 q 个轴（q=0 为最高位）。
+    门作用方式：把态矢量 reshape 成 (左, 2, 右) 或 (左, 2, 中, 2, 右)，
+    在目标轴上 tensordot，再原地写回，从不构造 2^n × 2^n 矩阵。
+    CNOT / SWAP 是基矢置换，直接原地交换子块。
+    complex64 下 25 量子比特约 256MB，26 量子比特约 512MB。
+    """
+
+    def __init__(self, num_qubits: int, dtype=np.complex128):
+        self.num_qubits = num_qubits
+        self.psi = np.zeros(2 ** num_qubits, dtype=dtype)
+        self.psi[0] = 1.0
+
+    def reset(self):
+        """回到 |00...0⟩"""
+        self.psi[:] = 0
+        self.psi[0] = 1.0
+
+    def _split(self, *qubits):
+        """把态矢量视图 reshape 为目标轴分离的形状（qubits 需升序）"""
+        shape, prev = [], 0
+        for q in qubits:
+            shape += [2 ** (q - prev), 2]
+            prev = q + 1
+        shape.append(2 ** (self.num_qubits - prev))
+        return self.psi.reshape(shape)
+
+    def apply_1q(self, U: np.ndarray, q: int):
+        """单比特门：在第 q 轴上 tensordot"""
+        view = self._split(q)
+        result = np.tensordot(U.astype(self.psi.dtype, copy=False), view, axes=([1], [1]))
+        np.copyto(view, np.moveaxis(result, 0, 1))
+
+    def apply_2q(self, U: np.ndarray, a: int, b: int):
+        """双比特门：U 为 4×4 或 2×2×2×2，a 为高位输入/输出"""
+        U = U.reshape(2, 2, 2, 2).astype(self.psi.dtype, copy=False)
+        if a > b:
+            a, b = b, a
+            U = U.transpose(1, 0, 3, 2)
+        view = self._split(a, b)
+        result = np.tensordot(U, view, axes=([2, 3], [1, 3]))
+        np.copyto(view, result.transpose(2, 0, 3, 1, 4))
+
+    def cnot(self, control: int, target: int):
+        """受控非：控制位为1的子空间内交换目标位0/1两半"""
+        lo, hi = sorted((control, target))
+        view = self._split(lo, hi)
+        if control < target:
+            zero, one = view[:, 1, :, 0, :], view[:, 1, :, 1, :]
+        else:
+            zero, one = view[:, 0, :, 1, :], view[:, 1, :, 1, :]
+        tmp = zero.copy()
+        zero[...] = one
+        one[...] = tmp
+
+    def swap(self, a: int, b: int):
+        """交换两个量子比特：交换 |01⟩ 与 |10⟩ 子块"""
+        lo, hi = sorted((a, b))
+        view = self._split(lo, hi)
+        tmp = view[:, 0, :, 1, :].copy()
+        view[:, 0, :, 1, :] = view[:, 1, :, 0, :]
+        view[:, 1, :, 0, :] = tmp
+
+    def probabilities(self) -> np.ndarray:
+        """全部基矢的概率 |ψ|²"""
+        return np.abs(self.psi) ** 2
+
+    def marginal(self, q: int) -> np.ndarray:
+        """单个量子比特的 [P(0), P(1)]"""
+        return (np.abs(self._split(q)) ** 2).sum(axis=(0, 2))
+
+    def marginal_probabilities(self, qubits) -> np.ndarray:
+        """
+        若干量子比特的联合边缘分布，长度 2^k
+
+        结果下标按 qubits 给出的顺序编码（qubits[0] 为最高位）。
+        """
+        qubits = list(qubits)
+        probs = self.probabilities().astype(np.float64, copy=False).reshape((2,) * self.num_qubits)
+        others = tuple(q for q in range(self.num_qubits) if q not in qubits)
+        probs = probs.sum(axis=others)
+        kept = sorted(qubits)
+        probs = probs.transpose([kept.index(q) for q in qubits])
+        return probs.reshape(-1)
+
+    def sample(self, qubits, shots: int, rng=None) -> dict:
+        """
+        不坍缩地采样 shots 次：边缘分布只算一次，一次多项分布抽样得到计数
+
+        返回 {'位串': 次数}，位串按 qubits 顺序书写。
+        """
+        qubits = list(qubits)
+        rng = rng if rng is not None else np.random.default_rng()
+        probs = self.marginal_probabilities(qubits)
+        counts = rng.multinomial(shots, probs / probs.sum())
+        width = len(qubits)
+        return {format(int(i), f'0{width}b'): int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def measure(self, q: int, rng=None) -> int:
+        """测量第 q 个量子比特并坍缩"""
+        rng = rng if rng is not None else np.random
+        p0 = self.marginal(q)[0]
+        result = 0 if rng.random() < p0 else 1
+        view = self._split(q)
+        view[:, 1 - result, :] = 0
+        self.psi /= np.sqrt(p0 if result == 0 else 1 - p0)
+        return result
+
+    def apply_channel(self, channel: 'NoiseChannel', q: int, rng=None):
+        """
+        量子轨迹：按概率 ||K_k ψ||² 随机选一个 Kraus 算符作用并归一化
+
+        K†K ∝ I 的信道（退极化、退相位）概率与态无关，直接抽样；
+        抽中恒等分支时不触碰态矢量，对角分支只做两次逐元素乘。
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        probs = channel.probs
+        if probs is None:
+            if channel.gram_diagonal:
+                # K†K 对角（如振幅阻尼）：只需该量子比特的边缘分布
+                probs = channel.gram_diag @ self.marginal(q)
+            else:
+                view = self._split(q)
+                rho = np.einsum('iaj,ibj->ab', view, view.conj())
+                probs = np.array([np.trace(G @ rho).real for G in channel.gram])
+            probs = np.maximum(probs, 0)
+            probs /= probs.sum()
+        k = min(int(np.searchsorted(np.cumsum(probs), rng.random(), side='right')), len(probs) - 1)
+        if channel.identity[k]:
+            return
+        K = channel.kraus[k] / math.sqrt(probs[k])
+        if channel.diagonal[k]:
+            view = self._split(q)
+            view[:, 0, :] *= K[0, 0]
+            view[:, 1, :] *= K[1, 1]
+        else:
+            self.apply_1q(K, q)
+
+class DensityMatrix:
+    """
+    n量子比特密度矩阵 - 精确噪声演化（小 n）
+
+    ρ 按行优先展平后就是 2n 个量子比特的"态矢量"：行下标为量子比特 0..n-1，
+    列下标为 n..2n-1。于是 UρU† 只是在 q 上作用 U、在 n+q 上作用 U*，
+    信道 Σ KρK† 是作用在 (q, n+q) 上的双比特超算符 Σ K⊗K*，
+    全部复用 StateVector 的原地张量收缩。内存 16·4^n 字节（n=12 约 256MB）。
+    """
+
+    def __init__(self, num_qubits: int, dtype=np.complex128):
+        self.num_qubits = num_qubits
+        self.vec = StateVector(2 * num_qubits, dtype)
+
+    def reset(self):
+        """ρ = |00...0⟩⟨00...0|"""
+        self.vec.reset()
+
+    @property
+    def rho(self) -> np.ndarray:
+        dim = 2 ** self.num_qubits
+        return self.vec.psi.reshape(dim, dim)
+
+    def apply_1q(self, U: np.ndarray, q: int):
+        self.vec.apply_1q(U, q)
+        self.vec.apply_1q(U.conj(), self.num_qubits + q)
+
+    def apply_2q(self, U: np.ndarray, a: int, b: int):
+        n = self.num_qubits
+        self.vec.apply_2q(U, a, b)
+        self.vec.apply_2q(U.conj(), n + a, n + b)
+
+    def cnot(self, control: int, target: int):
+        self.vec.cnot(control, target)
+        self.vec.cnot(self.num_qubits + control, self.num_qubits + target)
+
+    def swap(self, a: int, b: int):
+        self.vec.swap(a, b)
+        self.vec.swap(self.num_qubits + a, self.num_qubits + b)
+
+    def apply_channel(self, channel: 'NoiseChannel', q: int, rng=None):
+        """精确信道：ρ → Σ K ρ K†（rng 仅为与 StateVector 接口一致）"""
+        self.vec.apply_2q(channel.superop, q, self.num_qubits + q)
+
+    def probabilities(self) -> np.ndarray:
+        return self.rho.diagonal().real.copy()
+
+    def purity(self) -> float:
+        """Tr(ρ²)，纯态为1，完全混态为 1/2^n"""
+        return float(np.vdot(self.vec.psi, self.vec.psi).real)
+
+class NoiseChannel:
+    """
+    预先算好的单比特信道
+
+    kraus: Kraus 算符；superop: 密度矩阵用的 Σ K⊗K*；
+    probs: K†K ∝ I 时各分支的固定概率（否则为 None，需按态计算）；
+    gram_diagonal: 各 K†K 都是对角阵时，分支概率只依赖单比特边缘分布。
+    """
+
+    def __init__(self, name: str, p: float):
+        self.name = name
+        self.p = p
+        self.kraus = NOISE_CHANNELS[name](p)
+        self.superop = sum(np.kron(K, K.conj()) for K in self.kraus).reshape(2, 2, 2, 2)
+        self.gram = [K.conj().T @ K for K in self.kraus]
+        self.gram_diag = np.array([G.diagonal().real for G in self.gram])
+        self.gram_diagonal = all(np.allclose(G, np.diag(G.diagonal())) for G in self.gram)
+        fixed = all(np.allclose(G, G[0, 0] * np.eye(2)) for G in self.gram)
+        self.probs = np.array([G[0, 0].real for G in self.gram]) if fixed else None
+        self.identity = [fixed and np.allclose(K, K[0, 0] * np.eye(2)) for K in self.kraus]
+        self.diagonal = [np.allclose(K, np.diag(K.diagonal())) for K in self.kraus]
+
+class NoiseModel:
+    """
+    噪声模型：每个门之后，对该门作用的每个量子比特依次施加各信道
+
+    depolarizing: 退极化概率 p；amplitude_damping: 振幅阻尼 γ；dephasing: 退相位概率 p
+    """
+
+    def __init__(self, depolarizing=0.0, amplitude_damping=0.0, dephasing=0.0):
+        rates = {'depolarizing': depolarizing, 'amplitude_damping': amplitude_damping,
+                 'dephasing': dephasing}
+        self.channels = [NoiseChannel(name, p) for name, p in rates.items() if p > 0]
+
+    def after(self, target, qubits, rng=None):
+        for q in qubits:
+            for channel in self.channels:
+                target.apply_channel(channel, q, rng)
+
+def _noisy_steps(circuit: 'Circuit', params):
+    """逐门展开线路（噪声插在每个原始门之后，所以不做门融合）"""
+    steps = []
+    for name, qubits, param in circuit.ops:
+        if len(qubits) == 2:
+            steps.append((name, qubits, None))
+            continue
+        if isinstance(param, str):
+            param = params[param]
+        U = GATE_MATRICES[name] if param is None else PARAM_GATES[name](param)
+        steps.append(('1q', qubits, U))
+    return steps
+
+def _run_noisy_steps(target, steps, noise: NoiseModel, rng=None):
+    """在 DensityMatrix 或 StateVector 上执行展开后的含噪线路"""
+    for name, qubits, U in steps:
+        if name == '1q':
+            target.apply_1q(U, qubits[0])
+        elif name == 'CNOT':
+            target.cnot(*qubits)
+        elif name == 'SWAP':
+            target.swap(*qubits)
+        noise.after(target, qubits, rng)
+    return target
+
+_TRAJECTORY_STATE = None  # 每个工作进程一个态矢量缓冲区，所有轨迹复用
+
+def _init_trajectory_worker(num_qubits, dtype):
+    global _TRAJECTORY_STATE
+    _TRAJECTORY_STATE = StateVector(num_qubits, dtype)
+
+def _trajectory_worker(task):
+    """run_noisy 轨迹模式的工作进程入口：返回 (Σp, Σp², 轨迹数)"""
+    seed_seq, steps, noise, count = task
+    state = _TRAJECTORY_STATE
+    rng = np.random.Generator(np.random.PCG64(seed_seq))
+    total = np.zeros(state.psi.size)
+    total_sq = np.zeros(state.psi.size)
+    for _ in range(count):
+        state.reset()
+        _run_noisy_steps(state, steps, noise, rng)
+        probs = state.probabilities()
+        total += probs
+        total_sq += probs ** 2
+    return total, total_sq, count
+
+class Circuit:
+    """
+    量子线路 - 记录门序列，编译后执行
+
+    单比特门：h / x / y / z / phase / rx / ry / rz，角度可以是常数，
+    也可以是参数名（字符串），运行时再绑定。双比特门：cnot / swap。
+    """
+
+    def __init__(self, num_qubits: int):
+        self.num_qubits = num_qubits
+        self.ops = []  # (门名, 量子比特元组, 参数)
+
+    def gate(self, name: str, q: int, param=None):
+        self.ops.append((name, (q,), param))
+        return self
+
+    def h(self, q):
+        return self.gate('H', q)
+
+    def x(self, q):
+        return self.gate('X', q)
+
+    def y(self, q):
+        return self.gate('Y', q)
+
+    def z(self, q):
+        return self.gate('Z', q)
+
+    def phase(self, q, phi):
+        return self.gate('PHASE', q, phi)
+
+    def rx(self, q, theta):
+        return self.gate('RX', q, theta)
+
+    def ry(self, q, theta):
+        return self.gate('RY', q, theta)
+
+    def rz(self, q, theta):
+        return self.gate('RZ', q, theta)
+
+    def cnot(self, control, target):
+        self.ops.append(('CNOT', (control, target), None))
+        return self
+
+    def swap(self, a, b):
+        self.ops.append(('SWAP', (a, b), None))
+        return self
+
+    def compile(self) -> 'CompiledCircuit':
+        """按结构编译（门序列 + 参数名），相同结构命中缓存，只需重新绑定角度"""
+        key = (self.num_qubits, tuple(self.ops))
+        compiled = _CIRCUIT_CACHE.get(key)
+        if compiled is None:
+            compiled = CompiledCircuit(self.num_qubits, self.ops)
+            _CIRCUIT_CACHE[key] = compiled
+            if len(_CIRCUIT_CACHE) > CIRCUIT_CACHE_SIZE:
+                _CIRCUIT_CACHE.popitem(last=False)
+        else:
+            _CIRCUIT_CACHE.move_to_end(key)
+        return compiled
+
+class CompiledCircuit:
+    """
+    编译后的线路：同一量子比特上连续的单比特门融合成一个 2×2 幺正
+
+    常数门在编译时就预先相乘；带参数名的门保留为占位，
+    bind() 时只计算几个 2×2 乘积，每个融合块对态矢量只扫描一遍。
+    """
+
+    def __init__(self, num_qubits: int, ops):
+        self.num_qubits = num_qubits
+        self.gate_count = len(ops)
+        self.steps = []  # ('1q', q, 因子列表) 或 (双比特门名, (a, b))
+        pending = {}
+
+        def flush(q):
+            factors = pending.pop(q, None)
+            if factors:
+                self.steps.append(('1q', q, factors))
+
+        for name, qubits, param in ops:
+            if len(qubits) == 2:
+                for q in qubits:
+                    flush(q)
+                self.steps.append((name, qubits))
+                continue
+            q = qubits[0]
+            if isinstance(param, str):
+                factor = (name, param)
+            elif param is None:
+                factor = GATE_MATRICES[name]
+            else:
+                factor = PARAM_GATES[name](param)
+            factors = pending.setdefault(q, [])
+            if factors and isinstance(factor, np.ndarray) and isinstance(factors[-1], np.ndarray):
+                factors[-1] = factor @ factors[-1]  # 常数门预先合并
+            else:
+                factors.append(factor)
+        for q in sorted(pending):
+            flush(q)
+
+    @property
+    def passes(self) -> int:
+        """执行时扫描态矢量的次数"""
+        return len(self.steps)
+
+    @property
+    def fusion_ratio(self) -> float:
+        return self.gate_count / max(self.passes, 1)
+
+    def bind(self, **params):
+        """绑定参数，得到可直接执行的步骤：('1q', q, U) 或 (门名, (a, b))"""
+        bound = []
+        for step in self.steps:
+            if step[0] != '1q':
+                bound.append(step)
+                continue
+            U = np.eye(2, dtype=complex)
+            for factor in step[2]:
+                if not isinstance(factor, np.ndarray):
+                    name, param = factor
+                    factor = PARAM_GATES[name](params[param])
+                U = factor @ U
+            bound.append(('1q', step[1], U))
+        return bound
+
+    def run(self, state: StateVector, **params) -> StateVector:
+        """在态矢量上执行（每个融合块一遍）"""
+        for step in self.bind(**params):
+            if step[0] == '1q':
+                state.apply_1q(step[2], step[1])
+            elif step[0] == 'CNOT':
+                state.cnot(*step[1])
+            elif step[0] == 'SWAP':
+                state.swap(*step[1])
+        return state
+
+CIRCUIT_CACHE_SIZE = 256
+_CIRCUIT_CACHE: 'OrderedDict[tuple, CompiledCircuit]' = OrderedDict()
+
+EIGH_CACHE_SIZE = 32
+_EIGH_CACHE: 'OrderedDict[tuple, tuple]' = OrderedDict()
+
+def _eigensystem(H):
+    """
+    厄米矩阵本征分解，按矩阵内容缓存（LRU）
+
+    同一个 Ĥ 在不同 t 下反复演化时只对角化一次；
+    键是形状、类型和内容摘要，哈希代价 O(d²) 远小于 eigh 的 O(d³)。
+    """
+    H = np.ascontiguousarray(H)
+    key = (H.shape, H.dtype.str, hashlib.blake2b(H.tobytes(), digest_size=16).digest())
+    cached = _EIGH_CACHE.get(key)
+    if cached is not None:
+        _EIGH_CACHE.move_to_end(key)
+        return cached
+    cached = np.linalg.eigh(H)
+    _EIGH_CACHE[key] = cached
+    if len(_EIGH_CACHE) > EIGH_CACHE_SIZE:
+        _EIGH_CACHE.popitem(last=False)
+    return cached
+
+def _is_sparse(H) -> bool:
+    """是否为 scipy.sparse 矩阵（scipy 为可选依赖）"""
+    try:
+        from scipy.sparse import issparse
+    except ImportError:
+        return False
+    return issparse(H)
 
 class SchrodingerCPU:
-    def __init__(self):
+    def __init__(self, num_qubits=4, dtype=np.complex128):
         self.instructions = self._define_instructions()
+        # 联合量子寄存器 (n量子比特态矢量，支持纠缠)
+        self.qstate = StateVector(num_qubits, dtype)
         # 量子寄存器 (波函数)
         self.qregs = {
             'Q0': np.array([1, 0], dtype=complex),  # |0⟩
@@ -97,22 +581,19 @@ class SchrodingerCPU:
     
     def h_gate(self, qreg):
         """Hadamard门 - 创建叠加态"""
-        H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
-        self.qregs[qreg] = H @ self.qregs[qreg]
+        self.qregs[qreg] = GATE_MATRICES['H'] @ self.qregs[qreg]
     
     def x_gate(self, qreg):
         """Pauli-X门 - 量子非门"""
-        X = np.array([[0, 1], [1, 0]], dtype=complex)
-        self.qregs[qreg] = X @ self.qregs[qreg]
+        self.qregs[qreg] = GATE_MATRICES['X'] @ self.qregs[qreg]
     
     def z_gate(self, qreg):
         """Pauli-Z门 - 相位翻转"""
-        Z = np.array([[1, 0], [0, -1]], dtype=complex)
-        self.qregs[qreg] = Z @ self.qregs[qreg]
+        self.qregs[qreg] = GATE_MATRICES['Z'] @ self.qregs[qreg]
     
     def phase_gate(self, qreg, phi):
         """相位门"""
-        P = np.array([[1, 0], [0, cmath.exp(1j * phi)]], dtype=complex)
+        P = PARAM_GATES['PHASE'](phi)
         self.qregs[qreg] = P @ self.qregs[qreg]
     
     def evolve(self, qreg, hamiltonian, time):
@@ -123,13 +604,54 @@ class SchrodingerCPU:
     
     def _evolution_operator(self, H, t):
         """计算演化算符 U = e^(-iĤt/ℏ)"""
-        # 对角化哈密顿量
-        eigenvalues, eigenvectors = np.linalg.eigh(H)
+        # 对角化哈密顿量（按内容缓存）
+        eigenvalues, eigenvectors = _eigensystem(H)
         # 构造演化算符
         D = np.diag(np.exp(-1j * eigenvalues * t / self.hbar))
         U = eigenvectors @ D @ eigenvectors.conj().T
         return U
     
+    def evolve_many(self, hamiltonian, times, psi0=None):
+        """
+        批量时间演化：一次返回多个时刻的 ψ(t)，形状 (len(times), d)
+
+        psi0 默认取联合寄存器，也可以是寄存器名或任意态矢量。
+        稠密 Ĥ：复用缓存的本征分解，ψ(t) = V·diag(e^(-iλt/ℏ))·V†ψ0，
+        所有时刻的相位因子一次向量化求出。
+        稀疏 Ĥ (scipy.sparse)：走 Krylov expm_multiply，从不构造稠密 U。
+        """
+        if psi0 is None:
+            psi0 = self.qstate.psi
+        elif isinstance(psi0, str):
+            psi0 = self.qregs[psi0]
+        times = np.asarray(times, dtype=float)
+        if _is_sparse(hamiltonian):
+            return self._evolve_sparse(hamiltonian, times, psi0)
+        eigenvalues, eigenvectors = _eigensystem(hamiltonian)
+        coeffs = eigenvectors.conj().T @ psi0
+        phases = np.exp(-1j * np.outer(times, eigenvalues) / self.hbar)
+        return (phases * coeffs) @ eigenvectors.T
+    
+    def _evolve_sparse(self, H, times, psi0):
+        """稀疏哈密顿量：expm_multiply 只做矩阵-向量乘"""
+        from scipy.sparse.linalg import expm_multiply
+        
+        A = (-1j / self.hbar) * H.tocsr()
+        steps = np.diff(times)
+        if len(times) > 2 and np.allclose(steps, steps[0]):
+            # 等间隔时刻：一次调用得到全部
+            return expm_multiply(A, psi0, start=times[0], stop=times[-1],
+                                 num=len(times), endpoint=True)
+        # 任意时刻：按时间排序后逐段推进
+        order = np.argsort(times)
+        states = np.empty((len(times), len(psi0)), dtype=complex)
+        psi, now = np.asarray(psi0, dtype=complex), 0.0
+        for i in order:
+            psi = expm_multiply(A * (times[i] - now), psi)
+            now = times[i]
+            states[i] = psi
+        return states
+    
     def measure(self, qreg):
         """测量 - 波函数坍缩"""
         psi = self.qregs[qreg]
@@ -148,6 +670,112 @@ class SchrodingerCPU:
         
         return result, prob_0, prob_1
     
+    def sample(self, qubits=None, shots=1024, rng=None):
+        """
+        统计采样 - 不坍缩联合寄存器，返回位串计数
+
+        qubits 可为 'Q0' 风格名字或下标（默认全部）；rng 可为 numpy Generator
+        或 rng_service 的随机流。需要中途坍缩时仍用 measure / qstate.measure。
+        """
+        if qubits is None:
+            qubits = range(self.qstate.num_qubits)
+        rng = getattr(rng, 'generator', rng)
+        return self.qstate.sample([self._qubit(q) for q in qubits], shots, rng)
+    
+    def _qubit(self, qreg):
+        """'Q3' 或 3 → 联合寄存器中的量子比特下标"""
+        return int(qreg[1:]) if isinstance(qreg, str) else qreg
+    
+    def gate(self, name, qreg):
+        """在联合寄存器上作用单比特门 (H/X/Y/Z)"""
+        self.qstate.apply_1q(GATE_MATRICES[name], self._qubit(qreg))
+    
+    def cnot(self, control, target):
+        """CNOT门 - 受控非"""
+        self.qstate.cnot(self._qubit(control), self._qubit(target))
+    
+    def swap(self, a, b):
+        """SWAP门 - 交换两个量子比特"""
+        self.qstate.swap(self._qubit(a), self._qubit(b))
+    
+    def entangle(self, a, b, U=CZ_MATRIX):
+        """纠缠门 - 任意双比特幺正（默认受控Z）"""
+        self.qstate.apply_2q(U, self._qubit(a), self._qubit(b))
+    
+    def bell_state(self, a, b):
+        """制备Bell态: 从 |00⟩ 得到 (|00⟩ + |11⟩)/√2"""
+        self.gate('H', a)
+        self.cnot(a, b)
+    
+    def run_circuit(self, circuit, joint=True, **params):
+        """
+        执行线路（编译结果按结构缓存）
+
+        joint=True 作用在联合寄存器上；joint=False 作用在独立寄存器 Q0..Q3 上，
+        每个寄存器只做一次融合后的 2×2 乘法（此时不允许双比特门）。
+        """
+        compiled = circuit.compile()
+        if joint:
+            return compiled.run(self.qstate, **params)
+        for step in compiled.bind(**params):
+            if step[0] != '1q':
+                raise ValueError(f"独立寄存器不支持双比特门: {step[0]}")
+            qreg = f'Q{step[1]}'
+            self.qregs[qreg] = step[2] @ self.qregs[qreg]
+    
+    def run_noisy(self, circuit, noise, mode='density', trajectories=1000, workers=1,
+                  seed=None, dtype=np.complex128, **params):
+        """
+        含噪线路执行，两种模式同一接口
+
+        mode='density'     精确密度矩阵演化（n ≲ 12）
+        mode='trajectory'  蒙特卡洛量子轨迹：每条轨迹是一次随机 Kraus 选择下的纯态演化，
+                           workers>1 时分块交给进程池，每个工作进程只分配一个态矢量缓冲区
+        返回 {'mode', 'probabilities', 'stderr', 'trajectories', 'purity'}，
+        密度矩阵模式 stderr 为0、purity 为 Tr(ρ²)；轨迹模式 purity 为 None。
+        """
+        global _TRAJECTORY_STATE
+        steps = _noisy_steps(circuit, params)
+        n = circuit.num_qubits
+        if mode == 'density':
+            rho = _run_noisy_steps(DensityMatrix(n, dtype), steps, noise)
+            probs = rho.probabilities()
+            return {'mode': mode, 'probabilities': probs, 'stderr': np.zeros_like(probs),
+                    'trajectories': None, 'purity': rho.purity()}
+        if mode != 'trajectory':
+            raise ValueError(f"未知模式: {mode}")
+        
+        from rng_service import RNGService
+        
+        chunks = max(workers, 1) * 4 if workers > 1 else 1
+        sizes = [trajectories // chunks + (i < trajectories % chunks) for i in range(chunks)]
+        tasks = [(seed_seq, steps, noise, size)
+                 for seed_seq, size in zip(RNGService(seed).worker_seeds(chunks), sizes) if size]
+        if workers > 1:
+            from multiprocessing import Pool
+            with Pool(workers, initializer=_init_trajectory_worker, initargs=(n, dtype)) as pool:
+                results = pool.map(_trajectory_worker, tasks)
+        else:
+            _init_trajectory_worker(n, dtype)
+            try:
+                results = [_trajectory_worker(task) for task in tasks]
+            finally:
+                _TRAJECTORY_STATE = None  # 进程内运行时不留下 2^n 的态矢量
+        total = sum(r[0] for r in results)
+        total_sq = sum(r[1] for r in results)
+        mean = total / trajectories
+        var = np.maximum(total_sq / trajectories - mean ** 2, 0)
+        return {'mode': mode, 'probabilities': mean,
+                'stderr': np.sqrt(var / max(trajectories - 1, 1)),
+                'trajectories': trajectories, 'purity': None}
+    
+    def decohere(self, qreg, channel='dephasing', p=0.1):
+        """退相干 - 对独立寄存器做一次单条轨迹的噪声信道"""
+        state = StateVector(1)
+        state.psi[:] = self.qregs[qreg]
+        state.apply_channel(NoiseChannel(channel, p), 0)
+        self.qregs[qreg] = state.psi
+    
     def normalize(self, qreg):
         """归一化波函数"""
         psi = self.qregs[qreg]
@@ -294,6 +922,109 @@ def demonstrate_schrodinger_computing():
     print(f"  相位π/2后: ψ = {cpu.qregs['Q0']}")
     cpu.phase_gate('Q0', np.pi/2)
     print(f"  相位π后: ψ = {cpu.qregs['Q0']}")
+    
+    # 7. 多量子比特态矢量：纠缠
+    print("\n7. Bell态 (联合态矢量):")
+    cpu.bell_state('Q0', 'Q1')
+    probs = cpu.qstate.probabilities().reshape(4, -1).sum(axis=1)
+    print(f"  P(|00⟩)={probs[0]:.3f}, P(|01⟩)={probs[1]:.3f}, "
+          f"P(|10⟩)={probs[2]:.3f}, P(|11⟩)={probs[3]:.3f}")
+    counts = cpu.sample(['Q0', 'Q1'], shots=10000)
+    print(f"  采样10000次 (不坍缩): {counts}")
+    
+    import time
+    n = 24
+    ghz = StateVector(n, dtype=np.complex64)
+    start = time.perf_counter()
+    ghz.apply_1q(GATE_MATRICES['H'], 0)
+    for q in range(n - 1):
+        ghz.cnot(q, q + 1)
+    elapsed = time.perf_counter() - start
+    probs = ghz.probabilities()
+    print(f"\n  {n}量子比特GHZ态 ({ghz.psi.nbytes / 2**20:.0f}MB): {elapsed:.2f}s")
+    print(f"  P(|0...0⟩)={probs[0]:.3f}, P(|1...1⟩)={probs[-1]:.3f}")
+    
+    start = time.perf_counter()
+    counts = ghz.sample([0, n // 2, n - 1], shots=1_000_000)
+    elapsed = time.perf_counter() - start
+    print(f"  GHZ 采样3个量子比特×100万次: {elapsed * 1000:.0f}ms, {counts}")
+    
+    # 8. 演化算符缓存 + 批量演化
+    print("\n8. 批量时间演化:")
+    H = np.array([[1, 0.5], [0.5, 2]], dtype=complex)
+    states = cpu.evolve_many(H, np.linspace(0, 2, 5), psi0='Q1')
+    for t, psi in zip(np.linspace(0, 2, 5), states):
+        print(f"  t={t:.1f}: ψ(t) = {psi[0]:.3f}|0⟩ + {psi[1]:.3f}|1⟩")
+    print(f"  本征分解缓存: {len(_EIGH_CACHE)}条（5个时刻只对角化一次）")
+    
+    try:
+        import scipy.sparse as sp
+    except ImportError:
+        sp = None
+    if sp is not None:
+        # 横场伊辛链：16量子比特稀疏哈密顿量，不构造 65536×65536 的 U
+        n = 16
+        X = sp.csr_matrix(GATE_MATRICES['X'].real)
+        Z = sp.csr_matrix(GATE_MATRICES['Z'].real)
+        def site(op, k):
+            return sp.kron(sp.kron(sp.identity(2 ** k), op), sp.identity(2 ** (n - k - 1)), format='csr')
+        H_ising = sum(site(Z, k) @ site(Z, k + 1) for k in range(n - 1)) + sum(site(X, k) for k in range(n))
+        psi0 = np.zeros(2 ** n, dtype=complex)
+        psi0[0] = 1
+        start = time.perf_counter()
+        states = cpu.evolve_many(H_ising, np.linspace(0, 1, 11), psi0=psi0)
+        elapsed = time.perf_counter() - start
+        print(f"  16量子比特伊辛链 (稀疏, nnz={H_ising.nnz:,}): 11个时刻 {elapsed:.2f}s, "
+              f"t=1时 P(0...0)={abs(states[-1][0])**2:.4f}")
+    
+    # 9. 门融合 + 线路缓存
+    print("\n9. 门融合与线路缓存 (16量子比特, 40层):")
+    n, depth = 16, 40
+    circuit = Circuit(n)
+    for layer in range(depth):
+        for q in range(n):
+            circuit.h(q).rz(q, f'theta{q}').x(q).phase(q, np.pi / 4)
+        if layer % 10 == 9:
+            for q in range(0, n - 1, 2):
+                circuit.cnot(q, q + 1)
+    compiled = circuit.compile()
+    print(f"  门数: {compiled.gate_count}, 态矢量扫描: {compiled.passes} "
+          f"(融合比 {compiled.fusion_ratio:.0f}×)")
+    for trial in range(3):
+        angles = {f'theta{q}': 0.1 * (q + trial) for q in range(n)}
+        start = time.perf_counter()
+        state = StateVector(n)
+        circuit.compile().run(state, **angles)
+        elapsed = time.perf_counter() - start
+        print(f"  运行{trial + 1} (重新绑定角度, 缓存{len(_CIRCUIT_CACHE)}条): {elapsed * 1000:.1f}ms, "
+              f"P(0...0)={state.probabilities()[0]:.4f}")
+    
+    # 10. 噪声：密度矩阵 vs 量子轨迹
+    print("\n10. 含噪GHZ线路 (退极化1%, 振幅阻尼2%, 退相位1%):")
+    noise = NoiseModel(depolarizing=0.01, amplitude_damping=0.02, dephasing=0.01)
+    n = 6
+    ghz_circuit = Circuit(n).h(0)
+    for q in range(n - 1):
+        ghz_circuit.cnot(q, q + 1)
+    for mode in ('density', 'trajectory'):
+        start = time.perf_counter()
+        result = cpu.run_noisy(ghz_circuit, noise, mode=mode, trajectories=2000, seed=7)
+        elapsed = time.perf_counter() - start
+        probs, err = result['probabilities'], result['stderr']
+        extra = f", 纯度 Tr(ρ²)={result['purity']:.3f}" if result['purity'] is not None else ""
+        print(f"  {mode:<10}: P(0...0)={probs[0]:.4f}±{err[0]:.4f}, "
+              f"P(1...1)={probs[-1]:.4f}±{err[-1]:.4f}, {elapsed:.2f}s{extra}")
+    
+    n = 16
+    ghz_circuit = Circuit(n).h(0)
+    for q in range(n - 1):
+        ghz_circuit.cnot(q, q + 1)
+    start = time.perf_counter()
+    result = cpu.run_noisy(ghz_circuit, noise, mode='trajectory', trajectories=200, seed=7)
+    elapsed = time.perf_counter() - start
+    probs = result['probabilities']
+    print(f"  {n}量子比特 (密度矩阵需 {16 * 4 ** n / 2**30:.0f}GB, 轨迹模式): "
+          f"P(0...0)+P(1...1)={probs[0] + probs[-1]:.3f}, 200条轨迹 {elapsed:.2f}s")
 
 def analyze_schrodinger_cpu():
     """分析薛定谔CPU"""